@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+asyncio runtime for continuous monitoring
+
+Scraping runs on a single dedicated thread (WebDriver is not thread-safe),
+while notification, log writing and persistence are separate tasks fed by
+their own queues. A cycle only waits for the scrape itself, so the next
+scrape can start while the previous cycle's side effects are still running.
+
+Each queue has its own worker thread, so a hung notification can't hold up
+saving. A thread can't be interrupted, so a handler that overruns its
+timeout is reported and its queue is moved to a fresh thread.
+"""
+
+import os
+import asyncio
+from collections import Counter
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from monitor_logging import get_logger, flush_logs
+
+logger = get_logger('async_runtime')
+
+
+class AsyncMonitorRuntime:
+    """Overlaps scraping with notification, logging and persistence"""
+
+    def __init__(self, monitor, headless=True):
+        self.monitor = monitor
+        self.headless = headless
+
+        # Timeouts (seconds) for each phase
+        self.scrape_timeout = float(os.getenv('SCRAPE_TIMEOUT', 600))
+        self.notify_timeout = float(os.getenv('NOTIFY_TIMEOUT', 30))
+        self.log_timeout = float(os.getenv('LOG_TIMEOUT', 30))
+        self.persist_timeout = float(os.getenv('PERSIST_TIMEOUT', 60))
+        self.shutdown_timeout = float(os.getenv('SHUTDOWN_TIMEOUT', 30))
+
+        self.driver_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='webdriver')
+        self.executors = {}  # Queue name -> its own single-thread executor
+        self.hung_handlers = Counter()  # Queue name -> threads abandoned after a timeout
+
+        self.loop = None
+        self.notify_queue = None
+        self.log_queue = None
+        self.persist_queue = None
+        self.workers = []
+        self.cycles = 0
+
+    # Called on the WebDriver thread -----------------------------------
+
+    def _on_new_posts(self, batch):
+        """Hand a batch of new posts from the scrape thread to the event loop"""
+        self.loop.call_soon_threadsafe(self._fan_out, list(batch))
+
+    def _fan_out(self, batch):
+        # An empty batch means every new post was suppressed or claimed elsewhere; it still needs saving
+        if batch:
+            self.notify_queue.put_nowait(batch)
+            self.log_queue.put_nowait(('posts', batch))
+        self.persist_queue.put_nowait(True)
+
+    def _scrape(self):
+        return self.monitor.run_once(headless=self.headless, on_new_posts=self._on_new_posts)
+
+    # Side-effect handlers, each queue on its own thread ----------------
+
+    def _executor(self, name):
+        executor = self.executors.get(name)
+        if executor is None:
+            executor = self.executors[name] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'monitor-{name}')
+        return executor
+
+    def _notify(self, batch):
+        self.monitor.notify_new_posts(batch, log=False)
+
+    def _log(self, item):
+        kind, payload = item
+        if kind == 'posts':
+            self.monitor.log_new_posts(payload)
+        elif kind == 'stats':
+            self.monitor.show_statistics()
+
+    def _persist(self, _):
+        self.monitor.save_known_posts()
+
+    async def _worker(self, name, queue, handler, timeout, coalesce=False):
+        """Consume a queue, running each item's handler off the event loop"""
+        while True:
+            item = await queue.get()
+            drained = 1
+            if coalesce:
+                # Several pending saves collapse into one
+                while not queue.empty():
+                    queue.get_nowait()
+                    drained += 1
+            try:
+                async with asyncio.timeout(timeout):
+                    await self.loop.run_in_executor(self._executor(name), handler, item)
+            except TimeoutError:
+                # The hung thread is left to finish on its own; later items go to a new one
+                self.hung_handlers[name] += 1
+                self.executors.pop(name).shutdown(wait=False)
+                logger.error("❌ %s task hung for over %.0fs, moved the %s queue to a new thread "
+                             "(%d abandoned so far)", name, timeout, name, self.hung_handlers[name],
+                             extra={'event': 'hung_handler', 'queue': name,
+                                    'abandoned': self.hung_handlers[name]})
+            except Exception as e:
+                logger.warning("⚠️ %s task failed: %s", name, e, extra={'rate_key': name})
+            finally:
+                for _ in range(drained):
+                    queue.task_done()
+
+    # Main loop ---------------------------------------------------------
+
+    async def run_cycle(self):
+        """Run one scrape with a hard timeout; side effects are queued, not awaited"""
+        started = self.loop.time()
+        try:
+            async with asyncio.timeout(self.scrape_timeout):
+                await self.loop.run_in_executor(self.driver_executor, self._scrape)
+            logger.debug("✅ Scrape finished in %.1fs at %s", self.loop.time() - started, datetime.now())
+        except TimeoutError:
+            # Free the WebDriver thread so the next cycle isn't queued behind a hung call
+            logger.warning("⚠️ Scrape exceeded %.0fs, killing the browser", self.scrape_timeout)
+            self.monitor.kill_browser()
+        except Exception as e:
+            logger.error("❌ Error in monitoring loop: %s", e)
+        self.cycles += 1
+        if self.monitor.stats_every and self.cycles % self.monitor.stats_every == 0:
+            self.log_queue.put_nowait(('stats', None))
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self.notify_queue = asyncio.Queue()
+        self.log_queue = asyncio.Queue()
+        self.persist_queue = asyncio.Queue()
+        self.workers = [
+            asyncio.create_task(self._worker('notify', self.notify_queue, self._notify, self.notify_timeout)),
+            asyncio.create_task(self._worker('log', self.log_queue, self._log, self.log_timeout)),
+            asyncio.create_task(self._worker('persist', self.persist_queue, self._persist,
+                                             self.persist_timeout, coalesce=True)),
+        ]
+
+        logger.info("🚀 Starting Superset Post Monitor (async)")
+        logger.info("⏰ Checking every %d seconds", self.monitor.check_interval)
+        coordinator = self.monitor.coordinator
+        coordinator.start_heartbeat()
+        try:
+            while True:
+                if not await self.loop.run_in_executor(self._executor('coordination'), coordinator.ensure_leader):
+                    # Stand by until the active poller's lease runs out
+                    flush_logs()
+                    await asyncio.sleep(coordinator.poll_interval)
+                    continue
+                await self.run_cycle()
+                logger.debug("💤 Sleeping for %d seconds...", self.monitor.check_interval)
+                flush_logs()
+                await asyncio.sleep(self.monitor.check_interval)
+        finally:
+            coordinator.stop()
+            await self.shutdown()
+
+    async def shutdown(self):
+        """Give queued side effects a chance to finish, then stop the workers"""
+        try:
+            async with asyncio.timeout(self.shutdown_timeout):
+                for queue in (self.notify_queue, self.log_queue, self.persist_queue):
+                    await queue.join()
+        except TimeoutError:
+            logger.warning("⚠️ Pending notifications/saves did not finish before shutdown")
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        for executor in self.executors.values():
+            executor.shutdown(wait=False)
+        self.driver_executor.shutdown(wait=False)
+
+
+def run_async(monitor, headless=True):
+    """Blocking entry point for the async runtime"""
+    try:
+        asyncio.run(AsyncMonitorRuntime(monitor, headless=headless).run())
+    except KeyboardInterrupt:
+        logger.info("👋 Monitoring stopped by user")
+    flush_logs()
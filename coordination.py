@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Leader election and shared dedupe for running several monitors
+
+Instances share a backend (an SQLite file on shared storage, or an in-process
+stand-in when only one instance runs). One instance holds the poller lease and
+keeps renewing it from a heartbeat thread; the others stand by and take over
+once it expires. Every new post is claimed atomically before it is notified,
+so no two instances notify the same post, even while leadership is changing
+hands. Because the claim comes first, delivery is at-most-once: an instance
+that crashes between claiming a post and notifying it loses that notification.
+
+Claims are never dropped: the claims table is the fleet's record of every post
+already seen, so a standby whose own known-posts file is behind (or was just
+started) cannot notify an old post again when it takes over. One short row per
+post keeps it small.
+
+Lease expiry uses wall-clock time, so hosts sharing a backend need their
+clocks in sync (NTP) to within a small fraction of the lease TTL.
+"""
+
+import os
+import time
+import socket
+import sqlite3
+import threading
+from monitor_logging import get_logger
+
+logger = get_logger('coordination')
+
+LEASE_NAME = 'poller'
+
+
+class LocalCoordinationBackend:
+    """In-process stand-in backend for a single instance (or tests)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._leases = {}  # name -> (holder, expires_at)
+        self._claims = {}  # key -> (holder, claimed_at)
+
+    def try_acquire(self, name, holder, ttl, now):
+        with self._lock:
+            current = self._leases.get(name)
+            if current is None or current[0] == holder or current[1] <= now:
+                self._leases[name] = (holder, now + ttl)
+                return True
+            return False
+
+    def release(self, name, holder):
+        with self._lock:
+            if self._leases.get(name, (None,))[0] == holder:
+                del self._leases[name]
+
+    def holder(self, name, now):
+        with self._lock:
+            current = self._leases.get(name)
+            return current[0] if current and current[1] > now else None
+
+    def claim(self, key, holder, now):
+        with self._lock:
+            if key in self._claims:
+                return False
+            self._claims[key] = (holder, now)
+            return True
+
+
+class SQLiteCoordinationBackend:
+    """Backend on an SQLite file that every instance can reach"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS lease (name TEXT PRIMARY KEY, holder TEXT, expires_at REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS claims (post_key TEXT PRIMARY KEY, holder TEXT, claimed_at REAL)")
+
+    def _connect(self):
+        # One connection per thread; the heartbeat runs on its own thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            # WAL needs shared memory, which network filesystems don't provide
+            conn.execute("PRAGMA journal_mode=DELETE")
+            self._local.conn = conn
+        return conn
+
+    def try_acquire(self, name, holder, ttl, now):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT holder, expires_at FROM lease WHERE name = ?", (name,)).fetchone()
+            if row is None or row[0] == holder or row[1] <= now:
+                conn.execute(
+                    "INSERT OR REPLACE INTO lease (name, holder, expires_at) VALUES (?, ?, ?)",
+                    (name, holder, now + ttl)
+                )
+                acquired = True
+            else:
+                acquired = False
+            conn.execute("COMMIT")
+            return acquired
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def release(self, name, holder):
+        self._connect().execute("DELETE FROM lease WHERE name = ? AND holder = ?", (name, holder))
+
+    def holder(self, name, now):
+        row = self._connect().execute(
+            "SELECT holder FROM lease WHERE name = ? AND expires_at > ?", (name, now)
+        ).fetchone()
+        return row[0] if row else None
+
+    def claim(self, key, holder, now):
+        cursor = self._connect().execute(
+            "INSERT OR IGNORE INTO claims (post_key, holder, claimed_at) VALUES (?, ?, ?)",
+            (key, holder, now)
+        )
+        return cursor.rowcount == 1
+
+
+class Coordinator:
+    """Lease-based leadership plus at-most-once post claims for one instance"""
+
+    def __init__(self, backend, instance_id=None, lease_ttl=60):
+        self.backend = backend
+        self.instance_id = instance_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_ttl = lease_ttl
+        self.is_leader = False
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    @property
+    def poll_interval(self):
+        """How often standbys retry and the leader renews"""
+        return self.lease_ttl / 3
+
+    def ensure_leader(self):
+        """Acquire or renew the lease; returns whether we hold it"""
+        try:
+            was_leader = self.is_leader
+            self.is_leader = self.backend.try_acquire(LEASE_NAME, self.instance_id, self.lease_ttl, time.time())
+        except Exception as e:
+            logger.warning("⚠️ Coordination backend error: %s", e)
+            self.is_leader = False
+            return False
+
+        if self.is_leader and not was_leader:
+            logger.info("👑 %s is now the active poller", self.instance_id)
+        elif was_leader and not self.is_leader:
+            logger.warning("⚠️ %s lost the poller lease", self.instance_id)
+        return self.is_leader
+
+    def current_leader(self):
+        try:
+            return self.backend.holder(LEASE_NAME, time.time())
+        except Exception:
+            return None
+
+    def claim_posts(self, posts):
+        """Keep only the posts this instance is the first to claim
+
+        Posts claimed by another instance (now or at any time before) have
+        already been handled there and must not be enriched or notified again.
+        """
+        claimed = []
+        for post in posts:
+            try:
+                if self.backend.claim(post['title'].strip(), self.instance_id, time.time()):
+                    claimed.append(post)
+            except Exception as e:
+                # Better a possible duplicate than a missed post
+                logger.warning("⚠️ Could not claim post, notifying anyway: %s", e)
+                claimed.append(post)
+        return claimed
+
+    def start_heartbeat(self):
+        """Keep renewing (or trying to take) the lease in the background"""
+        if self._heartbeat and self._heartbeat.is_alive():
+            return
+        self._stop.clear()
+
+        def beat():
+            while not self._stop.wait(self.poll_interval):
+                self.ensure_leader()
+
+        self._heartbeat = threading.Thread(target=beat, name='lease-heartbeat', daemon=True)
+        self._heartbeat.start()
+
+    def stop(self):
+        """Stop the heartbeat and hand the lease back so a standby takes over immediately"""
+        self._stop.set()
+        if self.is_leader:
+            try:
+                self.backend.release(LEASE_NAME, self.instance_id)
+            except Exception:
+                pass
+            self.is_leader = False
+
+
+def coordinator_from_env(check_interval):
+    """COORDINATION_DB selects the shared SQLite file; without it the local stand-in is used"""
+    db_path = os.getenv('COORDINATION_DB')
+    backend = SQLiteCoordinationBackend(db_path) if db_path else LocalCoordinationBackend()
+    # Short enough that a standby takes over well within one check interval
+    lease_ttl = float(os.getenv('LEASE_TTL', min(60, max(check_interval / 2, 5))))
+    return Coordinator(backend, os.getenv('INSTANCE_ID'), lease_ttl)
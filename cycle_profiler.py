@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+CPU and allocation profiling for monitor cycles
+
+Used by run_monitor.py --profile. Each cycle runs under cProfile (in every
+thread it starts, since phases run on watchdog threads) and tracemalloc.
+Each cycle's stats are written to a .prof file that pstats or snakeviz can
+open, and summary.txt lists the top functions and allocation sites. It also
+splits each cycle's wall time into time waiting on WebDriver, local CPU, and
+everything else (sleeps and other I/O). Nothing here is imported unless
+profiling is requested.
+"""
+
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+
+# Every WebDriver command ends up in this HTTP round-trip to chromedriver
+WEBDRIVER_FUNCTIONS = (('remote_connection.py', '_request'),)
+TRACEBACK_DEPTH = 10
+
+
+class CycleProfiler:
+    """Profiles whole cycles and keeps the numbers for a summary"""
+
+    def __init__(self, output_dir='profiles', top=25):
+        self.output_dir = output_dir
+        self.top = top
+        self.cycles = []  # One dict of measurements per profiled cycle
+        self._combined = None
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _webdriver_time(self, stats):
+        total = 0.0
+        for (filename, _, function), (_, _, _, cumulative, _) in stats.stats.items():
+            if any(filename.endswith(name) and function == func for name, func in WEBDRIVER_FUNCTIONS):
+                total += cumulative
+        return total
+
+    def profile(self, fn, *args, **kwargs):
+        """Run one cycle under the profilers and record what it cost"""
+        index = len(self.cycles) + 1
+        thread_profilers = []
+        lock = threading.Lock()
+
+        def start_thread_profiler(frame, event, arg):
+            # Runs as the first profile event of each new thread; the profiler replaces this hook
+            profiler = cProfile.Profile()
+            with lock:
+                thread_profilers.append(profiler)
+            profiler.enable()
+
+        # Before 3.12 cProfile only sees the thread that enabled it
+        per_thread = sys.version_info < (3, 12)
+        tracemalloc.start(TRACEBACK_DEPTH)
+        profiler = cProfile.Profile()
+        if per_thread:
+            threading.setprofile(start_thread_profiler)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        profiler.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            if per_thread:
+                threading.setprofile(None)
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._record(index, profiler, thread_profilers, wall, cpu, snapshot, peak)
+
+    def _record(self, index, profiler, thread_profilers, wall, cpu, snapshot, peak):
+        stats = pstats.Stats(profiler)
+        with_threads = [p for p in thread_profilers if p.getstats()]
+        if with_threads:
+            stats.add(*with_threads)
+        path = os.path.join(self.output_dir, f"cycle-{index:03d}.prof")
+        stats.dump_stats(path)
+
+        if self._combined is None:
+            self._combined = pstats.Stats(path)
+        else:
+            self._combined.add(path)
+
+        webdriver = min(self._webdriver_time(stats), wall)
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        self.cycles.append({
+            'index': index,
+            'path': path,
+            'wall': wall,
+            'webdriver': webdriver,
+            'cpu': cpu,
+            'peak_memory': peak,
+            'allocations': snapshot.statistics('lineno')[:self.top],
+        })
+        print(f"🔬 Cycle {index}: {wall:.1f}s wall, {webdriver:.1f}s WebDriver, "
+              f"{cpu:.1f}s CPU, peak {peak / 1024 / 1024:.1f} MB -> {path}")
+
+    def _top_functions(self, stats, sort):
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats(sort).print_stats(self.top)
+        return stream.getvalue()
+
+    def summary(self):
+        """Human-readable report over every profiled cycle"""
+        lines = [f"Profiled {len(self.cycles)} cycle(s)", ""]
+        lines.append(f"{'cycle':>5} {'wall s':>8} {'webdriver':>10} {'local CPU':>10} {'other':>8} {'peak MB':>8}")
+        for cycle in self.cycles:
+            wall = cycle['wall'] or 1e-9
+            other = max(cycle['wall'] - cycle['webdriver'] - cycle['cpu'], 0.0)
+            lines.append(
+                f"{cycle['index']:>5} {cycle['wall']:>8.2f} {cycle['webdriver'] / wall:>10.1%} "
+                f"{cycle['cpu'] / wall:>10.1%} {other / wall:>8.1%} {cycle['peak_memory'] / 1024 / 1024:>8.1f}"
+            )
+        lines.append("")
+        lines.append("webdriver = waiting on chromedriver round-trips; local CPU = Python work in this")
+        lines.append("process; other = sleeps and remaining I/O (notifications, HTTP, disk)")
+
+        if self._combined is not None:
+            lines += ["", "Top functions by cumulative time (all cycles, all threads)", ""]
+            lines.append(self._top_functions(self._combined, 'cumulative'))
+            lines += ["Top functions by own time", ""]
+            lines.append(self._top_functions(self._combined, 'tottime'))
+
+        for cycle in self.cycles:
+            lines += [f"Top allocation sites still held at the end of cycle {cycle['index']}", ""]
+            for stat in cycle['allocations']:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size / 1024:>9.1f} KiB {stat.count:>7} blocks  {frame.filename}:{frame.lineno}")
+            lines.append("")
+        return '\n'.join(lines)
+
+    def write_summary(self):
+        path = os.path.join(self.output_dir, 'summary.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.summary())
+        print(f"📝 Profile summary written to {path}")
+        return path
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Superset student portal
+
+Serves a login form, a session cookie, and a dashboard whose feed is rendered
+in the browser from /api/feed pages as the scroll container reaches its
+bottom, like the real site. Feed size, page size, markup, response latency and
+session lifetime are all configurable, and new posts can be injected at the
+top of the feed while a monitor is running. Used by load_test.py; it can also
+be run on its own to point a monitor's .env at it:
+
+    python fake_superset.py --posts 1000 --port 8000
+    LOGIN_URL=http://127.0.0.1:8000/login DASHBOARD_URL=http://127.0.0.1:8000/students
+"""
+
+import sys
+import json
+import time
+import html
+import random
+import secrets
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Class names for each part of a post. 'superset' matches the live site;
+# 'restyled' renames every class, as a redesign would.
+MARKUP_PRESETS = {
+    'superset': {
+        'feed_header': 'feedHeader',
+        'title': 'text-base font-bold text-dark',
+        'meta': 'flex mt-1 flex-wrap',
+        'meta_span': 'text-gray-500 text-xs',
+        'prose': 'prose max-w-none',
+        'container': 'flex-grow overflow-scroll sm:mb-0',
+    },
+    'restyled': {
+        'feed_header': 'noticeHead',
+        'title': 'text-lg font-semibold text-black',
+        'meta': 'flex gap-2',
+        'meta_span': 'text-slate-400 text-sm',
+        'prose': 'notice-body',
+        'container': 'flex-1 overflow-y-auto',
+    },
+}
+
+AUTHORS = ['Sudhanshu Behera', 'Madhusmita Behera', 'Placement Cell', 'Training & Placement Office']
+COMPANIES = ['Qualcomm', 'CME Group', 'MosChip', 'TVS Motor Company', 'Aditya Birla', 'Marvell', 'EPAM', 'Techolution']
+ROLES = ['Software Engineer Intern', 'Data Science Intern', 'Analog Design', 'Territory Manager', 'GenAI Intern']
+KINDS = ['Open for applications', 'Registration for', 'Shortlist published for', 'Deadline for Applications changed']
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Superset - Login</title></head>
+<body>
+<form method="post" action="/login">
+  <input type="email" name="email" placeholder="Email">
+  <input type="password" name="password" placeholder="Password">
+  <button type="submit">Log in</button>
+  {error}
+</form>
+</body></html>"""
+
+DASHBOARD_PAGE = """<!DOCTYPE html>
+<html><head><title>Superset - Students</title></head>
+<body style="margin:0">
+<div id="feed" class="{container}" style="height:100vh;overflow-y:scroll"></div>
+<script>
+const feed = document.getElementById('feed');
+let page = 0, loading = false, done = false;
+function loadPage() {{
+  if (loading || done) return;
+  loading = true;
+  fetch('/api/feed?page=' + page, {{credentials: 'same-origin'}})
+    .then(r => r.ok ? r.json() : Promise.reject(r.status))
+    .then(data => {{
+      feed.insertAdjacentHTML('beforeend', data.html);
+      page += 1;
+      done = !data.has_more;
+    }})
+    .catch(status => {{ if (status === 401) window.location = '/login'; done = true; }})
+    .finally(() => {{ loading = false; }});
+}}
+feed.addEventListener('scroll', () => {{
+  if (feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 300) loadPage();
+}});
+loadPage();
+</script>
+</body></html>"""
+
+
+def time_ago(created_at, now):
+    seconds = max(int(now - created_at), 0)
+    for unit, size in (('day', 86400), ('hour', 3600), ('minute', 60)):
+        if seconds >= size:
+            count = seconds // size
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+    return "just now"
+
+
+class FakePost:
+    """One feed entry; its body is generated on demand to keep large feeds small"""
+
+    __slots__ = ('seq', 'title', 'author', 'created_at', 'injected_at')
+
+    def __init__(self, seq, title, author, created_at, injected_at=None):
+        self.seq = seq
+        self.title = title
+        self.author = author
+        self.created_at = created_at
+        self.injected_at = injected_at  # time.time() when added during a run
+
+    def body_html(self):
+        rng = random.Random(self.seq)
+        lines = [
+            "Eligibility",
+            "B.Tech. - Computer Science &amp; Engineering, Information Technology",
+            f"CGPA {rng.choice(['6.0', '6.5', '7.0', '7.5', '8.0'])} and above",
+            f"Batch: {rng.choice(['2026', '2026 &amp; 2027'])}",
+        ]
+        lines += [f"Round {i + 1}: {rng.choice(['Online Test', 'Technical Interview', 'HR Interview'])}"
+                  for i in range(rng.randint(1, 4))]
+        body = ''.join(f"<p>{line}</p>" for line in lines)
+        if rng.random() < 0.3:
+            body += f'<p><a href="https://forms.example.com/r/{self.seq}">Registration form</a></p>'
+        return body
+
+
+class FakeSuperset:
+    """The stand-in site plus controls for tests"""
+
+    def __init__(self, posts=100, page_size=20, markup='superset', latency=0.0, api_latency=0.0,
+                 session_ttl=0, username='student@example.com', password='password', host='127.0.0.1', port=0):
+        self.page_size = page_size
+        self.markup = MARKUP_PRESETS[markup] if isinstance(markup, str) else markup
+        self.latency = latency          # Added to every response
+        self.api_latency = api_latency  # Added on top for /api/feed pages
+        self.session_ttl = session_ttl  # 0 = sessions never expire
+        self.username = username
+        self.password = password
+        self.host = host
+        self.port = port
+
+        self._lock = threading.Lock()
+        self._sessions = {}  # token -> expires_at (or None)
+        self._next_seq = 0
+        self.posts = []  # Newest first
+        self.requests = {'login': 0, 'dashboard': 0, 'feed_pages': 0, 'expired': 0}
+        self._server = None
+        self._thread = None
+        self.add_posts(posts)
+
+    # Feed control -------------------------------------------------------
+
+    def _make_post(self, title=None, created_at=None, injected_at=None):
+        seq = self._next_seq
+        self._next_seq += 1
+        rng = random.Random(seq)
+        title = title or (f"{rng.choice(KINDS)} {rng.choice(COMPANIES)}'s Job Profile - "
+                          f"{rng.choice(ROLES)} #{seq}")
+        return FakePost(seq, title, rng.choice(AUTHORS), created_at or time.time(), injected_at)
+
+    def add_posts(self, count):
+        """Append count older posts to the bottom of the feed"""
+        with self._lock:
+            oldest = self.posts[-1].created_at if self.posts else time.time()
+            self.posts.extend(self._make_post(created_at=oldest - (i + 1) * 1800) for i in range(count))
+
+    def inject_post(self, title=None):
+        """Publish a new post at the top of the feed and return it"""
+        now = time.time()
+        with self._lock:
+            post = self._make_post(title, created_at=now, injected_at=now)
+            self.posts.insert(0, post)
+        return post
+
+    # Rendering ----------------------------------------------------------
+
+    def render_post(self, post, now):
+        m = self.markup
+        return (
+            f'<div class="mb-4 rounded bg-white">'
+            f'<div class="flex items-start">'
+            f'<div class="{m["feed_header"]}">'
+            f'<p class="{m["title"]}">{html.escape(post.title)}</p>'
+            f'<div class="{m["meta"]}">'
+            f'<span class="{m["meta_span"]}">{html.escape(post.author)}</span>'
+            f'<span class="{m["meta_span"]}">{time_ago(post.created_at, now)}</span>'
+            f'</div></div></div>'
+            f'<div class="{m["prose"]}">{post.body_html()}</div>'
+            f'</div>'
+        )
+
+    def feed_page(self, page):
+        """JSON for one page of the feed: the posts as data plus their rendered markup"""
+        now = time.time()
+        start = page * self.page_size
+        with self._lock:
+            posts = self.posts[start:start + self.page_size]
+            has_more = start + self.page_size < len(self.posts)
+        return {
+            'page': page,
+            'has_more': has_more,
+            'posts': [
+                {
+                    'id': post.seq,
+                    'title': post.title,
+                    'content': post.body_html(),
+                    'createdBy': {'firstName': post.author.split(' ')[0],
+                                  'lastName': ' '.join(post.author.split(' ')[1:])},
+                    'createdAt': int(post.created_at * 1000),
+                }
+                for post in posts
+            ],
+            'html': ''.join(self.render_post(post, now) for post in posts),
+        }
+
+    def count(self, kind):
+        """Count one request of a kind; handlers run on several threads"""
+        with self._lock:
+            self.requests[kind] += 1
+
+    # Sessions -----------------------------------------------------------
+
+    def new_session(self):
+        token = secrets.token_hex(16)
+        with self._lock:
+            self._sessions[token] = time.time() + self.session_ttl if self.session_ttl else None
+        return token
+
+    def session_valid(self, token):
+        with self._lock:
+            if token not in self._sessions:
+                return False
+            expires_at = self._sessions[token]
+            if expires_at is not None and expires_at <= time.time():
+                del self._sessions[token]
+                self.requests['expired'] += 1
+                return False
+            return True
+
+    def expire_sessions(self):
+        """Log every browser out, as the real portal does from time to time"""
+        with self._lock:
+            self._sessions.clear()
+
+    # Server -------------------------------------------------------------
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def login_url(self):
+        return f"{self.base_url}/login"
+
+    @property
+    def dashboard_url(self):
+        return f"{self.base_url}/students"
+
+    def start(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _session(self):
+                for part in self.headers.get('Cookie', '').split(';'):
+                    name, _, value = part.strip().partition('=')
+                    if name == 'session':
+                        return value
+                return None
+
+            def _send(self, status, body=b'', content_type='text/html; charset=utf-8', headers=None):
+                if site.latency:
+                    time.sleep(site.latency)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _redirect(self, location, headers=None):
+                self._send(302, headers=dict(headers or {}, Location=location))
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/login':
+                    site.count('login')
+                    self._send(200, LOGIN_PAGE.format(error='').encode('utf-8'))
+                elif url.path == '/students':
+                    site.count('dashboard')
+                    if not site.session_valid(self._session()):
+                        self._redirect('/login')
+                        return
+                    page = DASHBOARD_PAGE.format(container=site.markup['container'])
+                    self._send(200, page.encode('utf-8'))
+                elif url.path == '/api/feed':
+                    if not site.session_valid(self._session()):
+                        self._send(401, b'{"error": "session expired"}', 'application/json')
+                        return
+                    site.count('feed_pages')
+                    if site.api_latency:
+                        time.sleep(site.api_latency)
+                    page = int(parse_qs(url.query).get('page', ['0'])[0])
+                    body = json.dumps(site.feed_page(page)).encode('utf-8')
+                    self._send(200, body, 'application/json')
+                elif url.path == '/':
+                    self._redirect('/students')
+                else:
+                    self._send(404, b'Not found')
+
+            def do_POST(self):
+                if urlparse(self.path).path != '/login':
+                    self._send(404, b'Not found')
+                    return
+                length = int(self.headers.get('Content-Length', 0))
+                form = parse_qs(self.rfile.read(length).decode('utf-8'))
+                email = form.get('email', [''])[0]
+                password = form.get('password', [''])[0]
+                if email == site.username and password == site.password:
+                    token = site.new_session()
+                    self._redirect('/students', {'Set-Cookie': f"session={token}; Path=/; HttpOnly"})
+                else:
+                    page = LOGIN_PAGE.format(error='<p class="error">Invalid credentials</p>')
+                    self._send(200, page.encode('utf-8'))
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-superset', daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def main():
+    def option(flag, default):
+        if flag in sys.argv and sys.argv.index(flag) + 1 < len(sys.argv):
+            return sys.argv[sys.argv.index(flag) + 1]
+        return default
+
+    site = FakeSuperset(
+        posts=int(option('--posts', 100)),
+        page_size=int(option('--page-size', 20)),
+        markup=option('--markup', 'superset'),
+        latency=float(option('--latency', 0)),
+        session_ttl=float(option('--session-ttl', 0)),
+        port=int(option('--port', 8000)),
+    )
+    site.start()
+    print(f"🧪 Fake Superset running at {site.base_url} with {len(site.posts)} posts")
+    print(f"   LOGIN_URL={site.login_url}")
+    print(f"   DASHBOARD_URL={site.dashboard_url}")
+    print(f"   SUPERSET_USERNAME={site.username} SUPERSET_PASSWORD={site.password}")
+    print("💡 Press Enter to inject a new post, Ctrl+C to stop")
+    try:
+        while True:
+            input()
+            post = site.inject_post()
+            print(f"🆕 Injected: {post.title}")
+    except (KeyboardInterrupt, EOFError):
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
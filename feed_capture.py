@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Read feed posts from the dashboard's own API responses instead of the DOM
+
+Chrome's performance log reports every network response. JSON responses to
+XHR/fetch requests are read back with the DevTools Network.getResponseBody
+command while the page is navigated and scrolled, and any list of post-like
+objects in them is mapped straight to the same post dicts get_posts returns.
+No CSS selectors are involved, so styling changes don't affect it.
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from html_extractor import element_text
+from monitor_logging import get_logger
+
+logger = get_logger('feed_capture')
+
+# Candidate keys for each post field, most specific first
+TITLE_KEYS = ('title', 'subject', 'heading', 'headline')
+BODY_KEYS = ('content', 'body', 'description', 'details', 'message', 'text', 'html')
+AUTHOR_KEYS = ('author', 'createdBy', 'postedBy', 'created_by', 'posted_by', 'publisher', 'user')
+TIME_KEYS = ('createdAt', 'publishedAt', 'postedAt', 'created_at', 'published_at', 'posted_at',
+             'timestamp', 'date', 'time')
+ID_KEYS = ('id', '_id', 'uuid', 'postId', 'post_id')
+NAME_KEYS = ('name', 'fullName', 'full_name', 'displayName')
+
+JSON_MIME = re.compile(r'[/+]json\b')
+CAPTURED_TYPES = ('XHR', 'Fetch')
+
+
+def enable_performance_log(options):
+    """Ask chromedriver to buffer network events for FeedCapture"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+def _first(item, keys):
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def _author_name(value):
+    if isinstance(value, dict):
+        if value.get('firstName'):
+            return ' '.join(str(value[key]) for key in ('firstName', 'lastName') if value.get(key))
+        return str(_first(value, NAME_KEYS) or '')
+    return str(value or '')
+
+
+def _post_time(value):
+    """Timestamps in milliseconds or seconds become ISO strings; anything else is kept"""
+    if isinstance(value, (int, float)) and value > 0:
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+    return str(value or '')
+
+
+def _is_post(item):
+    return isinstance(item, dict) and isinstance(_first(item, TITLE_KEYS), str) and _first(item, BODY_KEYS) is not None
+
+
+def map_post(item, page_url='', found_at=None):
+    """Map one API object to a post dict in get_posts' shape"""
+    title = ' '.join(_first(item, TITLE_KEYS).split())
+    body = _first(item, BODY_KEYS)
+    if not isinstance(body, str):
+        body = json.dumps(body, ensure_ascii=False)
+
+    links = []
+    if '<' in body and '>' in body:
+        soup = BeautifulSoup(body, 'html.parser')
+        details = element_text(soup)
+        for link_elem in soup.find_all('a'):
+            href = link_elem.get('href')
+            if href:
+                links.append({'url': urljoin(page_url, href), 'text': element_text(link_elem)})
+    else:
+        details = body.strip()
+
+    post_time = _post_time(_first(item, TIME_KEYS))
+    post_id = _first(item, ID_KEYS)
+    return {
+        'title': title,
+        'author': _author_name(_first(item, AUTHOR_KEYS)),
+        'time': post_time,
+        'details': details,
+        'links': links,
+        'main_link': page_url,
+        'id': post_id if post_id is not None else hash(f"{title}{post_time}"),
+        'source_id': post_id,  # The API's own id, used to build the post's page URL
+        'found_at': found_at or datetime.now().isoformat()
+    }
+
+
+def posts_from_payload(payload, page_url='', found_at=None):
+    """Find the list(s) of post-like objects anywhere in a JSON payload and map them"""
+    posts = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            items = [item for item in node if _is_post(item)]
+            # A feed is a list that is mostly posts, not one stray object with a title
+            if items and len(items) * 2 >= len(node):
+                posts.extend(map_post(item, page_url, found_at) for item in items)
+            else:
+                stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+    return [post for post in posts if post['title']]
+
+
+class FeedCapture:
+    """Drains the performance log and turns captured feed responses into posts"""
+
+    def __init__(self, driver, page_url='', on_payload=None):
+        self.driver = driver
+        self.page_url = page_url
+        self.on_payload = on_payload  # Called with (url, body) for every captured feed response
+        self._pending = {}  # requestId -> response URL
+        self._seen_titles = set()
+        self.responses = 0
+        self.posts = 0
+
+    def _read_body(self, request_id):
+        result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        if result.get('base64Encoded'):
+            return None
+        return result.get('body')
+
+    def take_batch(self):
+        """Posts from feed responses that finished loading since the last call"""
+        batch = []
+        found_at = datetime.now().isoformat()
+        for entry in self.driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                if params.get('type') in CAPTURED_TYPES and JSON_MIME.search(response.get('mimeType', '')):
+                    self._pending[params['requestId']] = response.get('url')
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self._pending:
+                url = self._pending.pop(params['requestId'])
+                try:
+                    body = self._read_body(params['requestId'])
+                    if not body:
+                        continue
+                    posts = posts_from_payload(json.loads(body), self.page_url, found_at)
+                except Exception as e:
+                    logger.warning("⚠️ Could not read captured response %s: %s", url, e)
+                    continue
+                if not posts:
+                    continue
+
+                self.responses += 1
+                if self.on_payload:
+                    self.on_payload(url, body)
+                for post in posts:
+                    # The first page is often refetched; only hand each post out once
+                    key = post['title'].strip()
+                    if key not in self._seen_titles:
+                        self._seen_titles.add(key)
+                        batch.append(post)
+            elif method == 'Network.loadingFailed':
+                self._pending.pop(params.get('requestId'), None)
+
+        self.posts += len(batch)
+        return batch
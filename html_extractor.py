@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Extract posts from saved dashboard HTML without a browser
+
+Applies the same feedHeader rules as SupersetPostMonitor.get_posts to a page
+source string, using BeautifulSoup. Used to replay archived snapshots, to
+re-extract post history from saved pages and to read full post bodies from
+their detail pages.
+"""
+
+import gzip
+from datetime import datetime
+from urllib.parse import urljoin, urlparse
+from bs4 import BeautifulSoup, NavigableString, Comment
+
+# Selectors shared with the live extraction in post_monitor.py
+FEED_HEADER_CLASS = "feedHeader"
+TITLE_SELECTOR = "p.text-base.font-bold.text-dark"
+META_SELECTOR = "div.flex.mt-1.flex-wrap"
+META_SPAN_SELECTOR = "span.text-gray-500.text-xs"
+PROSE_SELECTORS = [
+    'div.prose',
+    'div[class*="prose"]',
+    'div p.text-sm.text-gray-600',
+    'div[class*="text-gray-600"]'
+]
+
+# Links to these count as attachments on a post's detail page
+ATTACHMENT_EXTENSIONS = (
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.csv', '.zip', '.png', '.jpg', '.jpeg'
+)
+
+MAX_TITLE_DEPTH = 6  # Levels above a detail page's body searched for the post's title
+
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul'
+}
+
+
+def element_text(element):
+    """Approximate Selenium's .text: one line per block element, whitespace collapsed"""
+    parts = []
+    for node in element.descendants:
+        if isinstance(node, Comment):
+            continue
+        if isinstance(node, NavigableString):
+            if node.parent is not None and node.parent.name in ('script', 'style'):
+                continue
+            parts.append(str(node))
+        elif node.name in BLOCK_TAGS:
+            parts.append('\n')
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_feed_header(header, page_url='', found_at=None):
+    """Turn one feedHeader element into a post dict, or None if it has no title"""
+    title_element = header.select_one(TITLE_SELECTOR)
+    if title_element is None:
+        return None
+    post_title = element_text(title_element).replace('\n', ' ').strip()
+
+    author = ""
+    post_time = ""
+    flex_div = header.select_one(META_SELECTOR)
+    spans = flex_div.select(META_SPAN_SELECTOR) if flex_div else []
+    if len(spans) >= 2:
+        author = element_text(spans[0])
+        post_time = element_text(spans[1])
+    elif len(spans) == 1:
+        # Sometimes author might be missing, so the single span is the time
+        post_time = element_text(spans[0])
+
+    post_details = ""
+    post_links = []
+    parent = header.parent
+    container = parent.parent if parent is not None and parent.parent is not None else parent
+    if container is not None:
+        for selector in PROSE_SELECTORS:
+            prose_element = container.select_one(selector)
+            if prose_element is not None:
+                post_details = element_text(prose_element)
+                for link_elem in prose_element.find_all('a'):
+                    href = link_elem.get('href')
+                    if href:
+                        post_links.append({
+                            'url': urljoin(page_url, href),
+                            'text': element_text(link_elem)
+                        })
+                break
+
+    main_link = page_url
+    detail_url = ''  # Only the card's own link can lead to the post's page
+    if parent is not None:
+        link_element = parent.find('a')
+        if link_element is not None and link_element.get('href'):
+            main_link = detail_url = urljoin(page_url, link_element['href'])
+
+    return {
+        'title': post_title,
+        'author': author,
+        'time': post_time,
+        'details': post_details,
+        'links': post_links,
+        'main_link': main_link,
+        'detail_url': detail_url,
+        'id': hash(f"{post_title}{post_time}"),
+        'found_at': found_at or datetime.now().isoformat()
+    }
+
+
+def extract_posts_from_html(html, page_url=''):
+    """Extract every feedHeader post from a page source string"""
+    soup = BeautifulSoup(html, 'html.parser')
+    found_at = datetime.now().isoformat()
+    posts = []
+    for header in soup.find_all(class_=FEED_HEADER_CLASS):
+        post = parse_feed_header(header, page_url, found_at)
+        if post and post['title']:
+            posts.append(post)
+    return posts
+
+
+def extract_posts_from_file(path, page_url=''):
+    """Extract posts from a saved page (.html, .htm or gzipped .html.gz); returns (path, size, posts)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        data = f.read()
+    return path, len(data), extract_posts_from_html(data.decode('utf-8', errors='replace'), page_url)
+
+
+def _normalized(text):
+    return ' '.join(text.split()).lower()
+
+
+def extract_post_detail(html, page_url='', title=''):
+    """Full body, links and attachments from a post's own page, or None
+
+    With a title, only a body that sits under that title is accepted: the
+    detail view can still show other posts' previews, and a redirect can land
+    on an unrelated page. Among the bodies closest to the title the longest
+    one wins.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    wanted = _normalized(title)
+    best = None
+    best_text = ''
+    best_depth = MAX_TITLE_DEPTH + 1
+    seen = set()
+    for selector in PROSE_SELECTORS:
+        for prose_element in soup.select(selector):
+            if id(prose_element) in seen:
+                continue
+            seen.add(id(prose_element))
+            depth = 0
+            if wanted:
+                # How far up from this body the post's title first appears
+                depth = next(
+                    (level for level, element in enumerate(
+                        [prose_element] + list(prose_element.parents)[:MAX_TITLE_DEPTH])
+                     if wanted in _normalized(element_text(element))),
+                    None
+                )
+                if depth is None:
+                    continue
+            text = element_text(prose_element)
+            if (depth, -len(text)) < (best_depth, -len(best_text)):
+                best, best_text, best_depth = prose_element, text, depth
+    if best is None:
+        return None
+
+    links = []
+    attachments = []
+    for link_elem in best.find_all('a'):
+        href = link_elem.get('href')
+        if not href:
+            continue
+        url = urljoin(page_url, href)
+        text = element_text(link_elem)
+        links.append({'url': url, 'text': text})
+        if link_elem.has_attr('download') or urlparse(url).path.lower().endswith(ATTACHMENT_EXTENSIONS):
+            name = link_elem.get('download') or text or urlparse(url).path.rsplit('/', 1)[-1]
+            attachments.append({'url': url, 'name': name})
+
+    return {'details': best_text, 'links': links, 'attachments': attachments}
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Expand shortened and redirecting links found in posts
+
+URLs are resolved concurrently through one pooled requests.Session, HEAD first
+with a GET fallback for servers that refuse HEAD. Results are kept in a
+persistent TTL cache so each URL is looked up once across posts and runs.
+"""
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from monitor_logging import get_logger
+
+logger = get_logger('link_resolver')
+
+USER_AGENT = "Mozilla/5.0 (compatible; SupersetPostMonitor link resolver)"
+FAILURE_TTL = 3600  # Retry failed lookups after an hour
+
+
+class LinkResolver:
+    """Concurrent, cached redirect resolution"""
+
+    def __init__(self, cache_path='link_cache.json', ttl=7 * 24 * 3600, max_workers=8, timeout=5):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = {}  # url -> {'resolved': str or None, 'status': int or None, 'resolved_at': float}
+        self.dirty = False
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except FileNotFoundError:
+            self.cache = {}
+        except (json.JSONDecodeError, ValueError):
+            logger.warning("⚠️ Error reading %s, starting with an empty link cache", self.cache_path)
+            self.cache = {}
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            with self._lock:
+                payload = json.dumps(self.cache, indent=2, ensure_ascii=False)
+                self.dirty = False
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning("⚠️ Error saving link cache: %s", e)
+
+    def _cached(self, url, now):
+        entry = self.cache.get(url)
+        if not entry:
+            return None
+        ttl = self.ttl if entry.get('resolved') else FAILURE_TTL
+        if now - entry.get('resolved_at', 0) > ttl:
+            return None
+        return entry
+
+    def _fetch(self, url):
+        """Follow redirects for one URL, HEAD first"""
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+            if response.status_code >= 400:
+                # Plenty of servers (and some shorteners) reject HEAD
+                response = self.session.get(url, allow_redirects=True, timeout=self.timeout, stream=True)
+                response.close()
+            return {'resolved': response.url, 'status': response.status_code, 'resolved_at': time.time()}
+        except requests.RequestException as e:
+            logger.warning("⚠️ Could not resolve %s: %s", url, e)
+            return {'resolved': None, 'status': None, 'resolved_at': time.time()}
+
+    def resolve_many(self, urls):
+        """Resolve a batch of URLs concurrently; returns {url: final_url or None}"""
+        now = time.time()
+        results = {}
+        pending = []
+        for url in dict.fromkeys(urls):
+            entry = self._cached(url, now)
+            if entry is not None:
+                results[url] = entry['resolved']
+            elif url.startswith(('http://', 'https://')):
+                pending.append(url)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                for url, entry in zip(pending, pool.map(self._fetch, pending)):
+                    with self._lock:
+                        self.cache[url] = entry
+                        self.dirty = True
+                    results[url] = entry['resolved']
+        return results
+
+    def resolve(self, url):
+        return self.resolve_many([url]).get(url)
+
+    def enrich_posts(self, posts):
+        """Add a 'resolved' target to every post link that redirects somewhere else"""
+        urls = [link['url'] for post in posts for link in post.get('links', []) if link.get('url')]
+        if not urls:
+            return 0
+
+        resolved = self.resolve_many(urls)
+        expanded = 0
+        for post in posts:
+            for link in post.get('links', []):
+                target = resolved.get(link.get('url'))
+                if target and target != link['url']:
+                    link['resolved'] = target
+                    expanded += 1
+        self.save()
+        return expanded
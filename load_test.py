@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Load harness: drive SupersetPostMonitor against the local fake Superset
+
+For each feed size a FakeSuperset is started, the monitor runs one warm-up
+cycle to learn the feed, and then every measured cycle is preceded by new
+posts injected at random moments during the interval before it. Reports
+cycle-time and detection-latency percentiles (injection to hand-off for
+notification) plus missed and spurious detections. Needs Chrome, but no
+credentials or network access.
+
+The monitor stops scrolling after MAX_SCROLL_ATTEMPTS steps, so the harness
+raises that limit to cover the whole feed (override with --max-scrolls), and
+scales the scroll and extract deadlines to match. If the
+warm-up still learns far fewer posts than the feed holds, the run is flagged:
+it measured a smaller feed than its label says.
+
+Every scroll step waits SCROLL_PAUSE seconds for the next page of posts. The
+real portal needs the default 2s; the fake one answers at once, so the harness
+uses --scroll-pause (0.2s by default). Even so a feed loads one page per step:
+100k posts at the default page size is 5000 steps, so pass a larger
+--page-size for feeds that big.
+
+    python load_test.py --sizes 10,1000,10000 --cycles 5 --inject 3 --interval 10
+    python load_test.py --sizes 100000 --page-size 500 --cycles 2
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import threading
+from fake_superset import FakeSuperset
+
+MIN_LEARNED_FRACTION = 0.9  # Warm-up must see this much of the feed for the run to count
+
+
+def get_option_value(flag, default=None):
+    """Return the argument following a flag, or the default"""
+    if flag in sys.argv:
+        index = sys.argv.index(flag)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_feed(size, cycles, inject, interval, headless, site_options, max_scrolls=None, scroll_pause=0.2):
+    """Run the monitor against one feed size and return its measurements"""
+    site = FakeSuperset(posts=size, **site_options)
+    site.start()
+    # One scroll step loads one feed page; leave a few steps of slack
+    max_scrolls = max_scrolls or size // site.page_size + 5
+
+    # The monitor reads everything from the environment and the working directory
+    os.environ.update({
+        'SUPERSET_USERNAME': site.username,
+        'SUPERSET_PASSWORD': site.password,
+        'LOGIN_URL': site.login_url,
+        'DASHBOARD_URL': site.dashboard_url,
+        'MAX_SCROLL_ATTEMPTS': str(max_scrolls),
+        'SCROLL_PAUSE': str(scroll_pause),
+        # Each step pauses for content to load; the defaults assume a few hundred posts
+        'DEADLINE_SCROLL': str(max(180, max_scrolls * (scroll_pause + 1) * 2)),
+        'DEADLINE_EXTRACT': str(max(300, size * 0.05)),
+    })
+    workdir = tempfile.mkdtemp(prefix=f"load-{size}-")
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+
+    from post_monitor import SupersetPostMonitor
+    detections = {}  # title -> time.time() the monitor handed it off
+
+    def on_new_posts(posts):
+        now = time.time()
+        for post in posts:
+            detections.setdefault(post['title'].strip(), now)
+
+    try:
+        monitor = SupersetPostMonitor()
+
+        print(f"\n🔥 Warm-up cycle against a {size}-post feed...")
+        started = time.perf_counter()
+        monitor.run_once(headless=headless, on_new_posts=on_new_posts)
+        monitor.save_known_posts()
+        warmup = time.perf_counter() - started
+        learned = len(detections)
+        detections.clear()
+        if learned < size * MIN_LEARNED_FRACTION:
+            print(f"⚠️ Warm-up only learned {learned} of {size} posts (scroll limit {max_scrolls}); "
+                  f"this run measures a {learned}-post feed")
+
+        injected = []
+        cycle_times = []
+        for cycle in range(cycles):
+            # New posts appear at random moments before the cycle that should catch them
+            interval_started = time.monotonic()
+            timers = [
+                threading.Timer(random.uniform(0, interval), lambda: injected.append(site.inject_post()))
+                for _ in range(inject)
+            ]
+            for timer in timers:
+                timer.start()
+            for timer in timers:
+                timer.join()
+            time.sleep(max(interval - (time.monotonic() - interval_started), 0))
+
+            print(f"\n⏱️ Measured cycle {cycle + 1}/{cycles} ({len(injected)} posts injected so far)")
+            started = time.perf_counter()
+            monitor.run_once(headless=headless, on_new_posts=on_new_posts)
+            cycle_times.append(time.perf_counter() - started)
+            monitor.save_known_posts()
+    finally:
+        os.chdir(previous_dir)
+        site.stop()
+
+    injected_titles = {post.title for post in injected}
+    latencies = [detections[post.title] - post.injected_at for post in injected if post.title in detections]
+    return {
+        'size': size,
+        'complete': learned >= size * MIN_LEARNED_FRACTION,
+        'warmup': warmup,
+        'learned': learned,
+        'cycle_times': cycle_times,
+        'latencies': latencies,
+        'injected': len(injected),
+        'missed': len(injected) - len(latencies),
+        'spurious': len([title for title in detections if title not in injected_titles]),
+        'feed_pages': site.requests['feed_pages'],
+        'expired_sessions': site.requests['expired'],
+    }
+
+
+def print_report(results):
+    print("\n📊 LOAD TEST RESULTS")
+    print("=" * 100)
+    print(f"{'feed':>8} {'learned':>8} {'warm-up':>8} {'cycle p50':>10} {'p95':>7} {'p99':>7} {'max':>7} "
+          f"{'detect p50':>11} {'p95':>7} {'max':>7} {'missed':>7} {'spurious':>9}")
+    for r in results:
+        cycles = r['cycle_times']
+        latencies = r['latencies']
+        flag = '' if r['complete'] else '!'
+        print(f"{r['size']:>8} {r['learned']:>7}{flag:1} {r['warmup']:>7.1f}s "
+              f"{percentile(cycles, 0.50):>9.1f}s {percentile(cycles, 0.95):>6.1f}s "
+              f"{percentile(cycles, 0.99):>6.1f}s {max(cycles, default=float('nan')):>6.1f}s "
+              f"{percentile(latencies, 0.50):>10.1f}s {percentile(latencies, 0.95):>6.1f}s "
+              f"{max(latencies, default=float('nan')):>6.1f}s {r['missed']:>4}/{r['injected']:<2} {r['spurious']:>9}")
+    print("=" * 100)
+    if not all(r['complete'] for r in results):
+        print(f"   ! warm-up learned under {MIN_LEARNED_FRACTION:.0%} of the feed: "
+              f"that row measures a feed of 'learned' posts, not 'feed'")
+    for r in results:
+        print(f"   {r['size']} posts: {r['feed_pages']} feed pages served, {r['expired_sessions']} expired session hits")
+
+
+def main():
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print(__doc__)
+        print("Options: --sizes N,N,..  --cycles N  --inject N  --interval S  --page-size N")
+        print("         --latency S  --api-latency S  --session-ttl S  --markup superset|restyled  --debug")
+        print("         --max-scrolls N   (default: enough scroll steps for the whole feed)")
+        print("         --scroll-pause S  (default: 0.2s after each scroll step)")
+        return
+
+    sizes = [int(size) for size in get_option_value("--sizes", "10,1000,10000").split(',')]
+    cycles = int(get_option_value("--cycles", 3))
+    inject = int(get_option_value("--inject", 2))
+    interval = float(get_option_value("--interval", 0))
+    site_options = {
+        'page_size': int(get_option_value("--page-size", 20)),
+        'markup': get_option_value("--markup", "superset"),
+        'latency': float(get_option_value("--latency", 0)),
+        'api_latency': float(get_option_value("--api-latency", 0)),
+        'session_ttl': float(get_option_value("--session-ttl", 0)),
+    }
+
+    print("🧪 Superset Post Monitor load test")
+    print("=" * 40)
+    print(f"Feeds: {sizes} • {cycles} measured cycles • {inject} new posts per cycle • {interval:g}s interval")
+
+    max_scrolls = get_option_value("--max-scrolls")
+    scroll_pause = float(get_option_value("--scroll-pause", 0.2))
+    results = [
+        run_feed(size, cycles, inject, interval, "--debug" not in sys.argv, site_options,
+                 int(max_scrolls) if max_scrolls else None, scroll_pause)
+        for size in sizes
+    ]
+    print_report(results)
+    return results
+
+
+if __name__ == "__main__":
+    main()
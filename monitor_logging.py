@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Logging setup for the monitor
+
+Replaces per-item print calls with leveled loggers. Per-post and per-scroll
+lines are DEBUG; INFO carries one summary line per cycle plus new posts and
+state changes. Output is plain text (the same emoji lines as before) or one
+JSON object per line, and when stdout isn't a terminal (journald, files) it
+is buffered and written once per cycle rather than line by line, or sooner
+once a line has waited LOG_FLUSH_INTERVAL (lines logged between cycles, such
+as notifications sent in the background, would otherwise wait for the next
+cycle). Repeats of
+the same warning are collapsed within a time window; errors are never dropped.
+
+Environment:
+    LOG_LEVEL          DEBUG, INFO (default), WARNING, ERROR
+    LOG_FORMAT         text (default) or json
+    LOG_RATE_WINDOW    seconds during which a repeated warning is shown once (default 300, 0 disables)
+    LOG_BUFFER         records buffered before a forced write when not on a terminal (default 500)
+    LOG_FLUSH_INTERVAL longest a buffered record waits to be written, in seconds (default 5, 0 disables)
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import MemoryHandler
+
+ROOT_LOGGER = 'superset_monitor'
+MAX_RATE_KEYS = 1000  # Distinct warnings remembered by the rate limiter
+
+# Attributes every LogRecord has; anything else was passed in `extra`
+_STANDARD_ATTRS = set(logging.LogRecord('', 0, '', 0, '', (), None).__dict__) | {'message', 'asctime'}
+
+_configured = False
+_handler = None
+
+
+def get_logger(name):
+    """Logger under the monitor's root, e.g. get_logger('post_monitor')"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any fields passed via extra"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage().strip(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Let a given warning through once per window and count the repeats
+
+    Warnings are told apart by their message template, so "%s failed" for
+    different URLs counts as one. Where the arguments matter (which phase
+    timed out, say) the call passes extra={'rate_key': ...} to keep them apart.
+    """
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self._lock = threading.Lock()
+        self._seen = {}  # (logger, template, rate_key) -> [last emitted, suppressed count]
+
+    def filter(self, record):
+        if record.levelno != logging.WARNING or not self.window:
+            return True
+        key = (record.name, str(record.msg), getattr(record, 'rate_key', None))
+        now = time.monotonic()
+        with self._lock:
+            state = self._seen.get(key)
+            if state and now - state[0] < self.window:
+                state[1] += 1
+                return False
+            if len(self._seen) >= MAX_RATE_KEYS:
+                self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.window}
+            suppressed = state[1] if state else 0
+            self._seen[key] = [now, 0]
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} (repeated {suppressed} more times in the last {self.window:g}s)"
+        return True
+
+
+class TimedMemoryHandler(MemoryHandler):
+    """MemoryHandler that also writes out records once the oldest has waited flush_interval"""
+
+    def __init__(self, capacity, flush_interval, flushLevel=logging.WARNING, target=None):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self.flush_interval = flush_interval
+        self._stopped = threading.Event()
+        if flush_interval:
+            threading.Thread(target=self._flush_periodically, name='log-flush', daemon=True).start()
+
+    def _flush_periodically(self):
+        # Nothing else may be logged for a while, so a record can't wait on the next emit
+        while not self._stopped.wait(self.flush_interval / 2):
+            with self.lock:
+                due = self.buffer and time.time() - self.buffer[0].created >= self.flush_interval
+            if due:
+                self.flush()
+
+    def close(self):
+        self._stopped.set()
+        super().close()
+
+
+def setup_logging(level=None, fmt=None):
+    """Configure the monitor's loggers once; later calls are no-ops"""
+    global _configured, _handler
+    if _configured:
+        return logging.getLogger(ROOT_LOGGER)
+
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    fmt = (fmt or os.getenv('LOG_FORMAT', 'text')).lower()
+    window = float(os.getenv('LOG_RATE_WINDOW', 300))
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if fmt == 'json' else logging.Formatter('%(message)s'))
+
+    if sys.stdout.isatty():
+        handler = stream
+    else:
+        # Written in one go at the end of each cycle (or on any warning, or once a line has waited too long)
+        handler = TimedMemoryHandler(int(os.getenv('LOG_BUFFER', 500)), float(os.getenv('LOG_FLUSH_INTERVAL', 5)),
+                                     flushLevel=logging.WARNING, target=stream)
+    handler.addFilter(RateLimitFilter(window))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(getattr(logging, level, logging.INFO))
+    root.addHandler(handler)
+    root.propagate = False
+    _handler = handler
+    _configured = True
+    return root
+
+
+def flush_logs():
+    """Write out anything buffered; called at the end of each cycle"""
+    if _handler is not None:
+        _handler.flush()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Hard per-phase deadlines for WebDriver work
+
+Each phase of a cycle (driver start, login, navigation, scrolling, extraction,
+fetching full post details, resolving links, driver stop) gets a time budget. Calls are run on a helper
+thread and the caller stops waiting once the phase's budget is used up, so a
+chromedriver call that never returns can't stall the monitor. The timeout callback is expected to kill the
+browser, which also unblocks the stuck thread.
+"""
+
+import os
+import signal
+import threading
+import subprocess
+import time
+from collections import deque
+from datetime import datetime
+
+PHASES = ('driver_start', 'login', 'navigate', 'scroll', 'extract', 'details', 'links', 'driver_stop')
+BROWSERLESS_PHASES = ('links',)  # Only talk to outside servers; a timeout there leaves the browser alone
+
+DEFAULT_DEADLINES = {
+    'driver_start': 120,
+    'login': 120,
+    'navigate': 60,
+    'scroll': 180,
+    'extract': 300,
+    'details': 120,
+    'links': 60,
+    'driver_stop': 30,
+}
+
+
+class PhaseTimeout(Exception):
+    """A phase ran past its deadline"""
+
+    def __init__(self, phase, elapsed, deadline):
+        super().__init__(f"{phase} phase exceeded its {deadline:g}s deadline ({elapsed:.1f}s)")
+        self.phase = phase
+        self.elapsed = elapsed
+        self.deadline = deadline
+
+
+def deadlines_from_env():
+    """Read DEADLINE_<PHASE> overrides (seconds, 0 disables) from the environment"""
+    return {
+        phase: float(os.getenv(f"DEADLINE_{phase.upper()}", default))
+        for phase, default in DEFAULT_DEADLINES.items()
+    }
+
+
+def kill_process_tree(pid):
+    """Kill a process and everything it started"""
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], capture_output=True)
+            return
+        pgid = os.getpgid(pid)
+        if pgid == os.getpgrp():
+            # Not in its own session - don't take ourselves down with it
+            os.kill(pid, signal.SIGKILL)
+        else:
+            os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class PhaseWatchdog:
+    """Runs calls under per-cycle phase budgets and keeps latency history"""
+
+    def __init__(self, deadlines=None, on_timeout=None, history=200):
+        self.deadlines = dict(DEFAULT_DEADLINES, **(deadlines or {}))
+        self.on_timeout = on_timeout
+        self.history = {phase: deque(maxlen=history) for phase in PHASES + ('cycle',)}
+        self.events = deque(maxlen=50)
+        self.timeouts = {phase: 0 for phase in PHASES}
+        self._spent = {}
+        self._cycle_started = None
+
+    def start_cycle(self):
+        self._spent = {phase: 0.0 for phase in PHASES}
+        self._cycle_started = time.perf_counter()
+
+    def end_cycle(self):
+        """Record how long each phase took this cycle"""
+        if self._cycle_started is None:
+            return
+        for phase, spent in self._spent.items():
+            if spent:
+                self.history[phase].append(spent)
+        self.history['cycle'].append(time.perf_counter() - self._cycle_started)
+        self._cycle_started = None
+
+    def run(self, phase, fn, *args, **kwargs):
+        """Call fn, giving up once the phase's remaining budget runs out"""
+        return self._run(phase, fn, args, kwargs)
+
+    def run_owned(self, phase, fn, dispose, *args, **kwargs):
+        """Like run, for calls that create something the caller must clean up
+
+        If fn only returns after the deadline, nobody is waiting for its result
+        any more, so it is passed to dispose instead (e.g. to quit a browser
+        that finished starting too late).
+        """
+        return self._run(phase, fn, args, kwargs, dispose)
+
+    def _run(self, phase, fn, args, kwargs, dispose=None):
+        deadline = self.deadlines.get(phase, 0)
+        if not deadline:
+            return fn(*args, **kwargs)
+
+        spent = self._spent.get(phase, 0.0)
+        remaining = deadline - spent
+        outcome = {}
+        lock = threading.Lock()
+
+        def target():
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                outcome['error'] = e
+                return
+            with lock:
+                abandoned = outcome.get('abandoned')
+                outcome['result'] = result
+            if abandoned and dispose:
+                dispose(result)
+
+        started = time.perf_counter()
+        worker = threading.Thread(target=target, name=f"phase-{phase}", daemon=True)
+        if remaining > 0:
+            worker.start()
+            worker.join(remaining)
+        elapsed = time.perf_counter() - started
+        self._spent[phase] = spent + elapsed
+
+        with lock:
+            timed_out = remaining <= 0 or 'result' not in outcome and 'error' not in outcome
+            outcome['abandoned'] = timed_out
+        if timed_out:
+            self.timeouts[phase] += 1
+            self.events.append({
+                'at': datetime.now().isoformat(),
+                'phase': phase,
+                'elapsed': spent + elapsed,
+                'deadline': deadline,
+            })
+            if self.on_timeout:
+                self.on_timeout(phase)
+            raise PhaseTimeout(phase, spent + elapsed, deadline)
+
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome.get('result')
+
+    def latency_summary(self):
+        """p50/p95/p99/max per phase over the recorded history"""
+        summary = {}
+        for phase, values in self.history.items():
+            if values:
+                summary[phase] = {
+                    'p50': _percentile(values, 0.50),
+                    'p95': _percentile(values, 0.95),
+                    'p99': _percentile(values, 0.99),
+                    'max': max(values),
+                    'timeouts': self.timeouts.get(phase, 0),
+                }
+        return summary
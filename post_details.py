@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Fetch the full body of new posts from their detail pages
+
+The feed only shows a truncated preview of each post. For posts classified as
+new, their detail pages are fetched in parallel over a small pool of HTTP
+connections that carry the browser's session cookies. Pages that come back
+without any post body (client-rendered views) are opened in a small pool of
+browser tabs instead, which load side by side. Known posts are never fetched.
+
+A post's page comes from the post itself: its card's own link, or in network
+mode the API's post id filled into DETAIL_URL_TEMPLATE. Feed previews often
+link back to the feed, which has no detail page, so those posts are skipped.
+A body is only accepted from a page on the portal's own host that shows the
+post's title.
+"""
+
+import time
+from urllib.parse import urldefrag, urlparse
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from html_extractor import extract_post_detail
+from monitor_logging import get_logger
+
+logger = get_logger('post_details')
+
+TAB_LOAD_TIMEOUT = 15  # Seconds to wait for one tab's post body to render
+
+
+def _normalize(url):
+    return urldefrag(url or '')[0].rstrip('/')
+
+
+def _host(url):
+    return (urlparse(url or '').hostname or '').lower()
+
+
+class DetailFetcher:
+    """Parallel detail-page fetches over HTTP with a browser-tab fallback"""
+
+    def __init__(self, max_workers=4, timeout=15, url_template=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.url_template = url_template  # e.g. https://portal/posts/{id}, for posts from the feed API
+
+    def detail_url(self, post, feed_urls):
+        """The post's own page on the portal, or None when it doesn't have a known one"""
+        url = post.get('detail_url') or ''
+        if not url and self.url_template and post.get('source_id') is not None:
+            url = self.url_template.format(id=post['source_id'])
+        if not url.startswith(('http://', 'https://')):
+            return None
+        if _normalize(url) in {_normalize(feed_url) for feed_url in feed_urls if feed_url}:
+            return None
+        if _host(url) not in {_host(feed_url) for feed_url in feed_urls if feed_url}:
+            return None
+        return url
+
+    def session_for(self, driver):
+        """A pooled session logged in with the browser's cookies"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if driver is not None:
+            session.headers['User-Agent'] = driver.execute_script("return navigator.userAgent")
+            for cookie in driver.get_cookies():
+                session.cookies.set(cookie['name'], cookie['value'],
+                                    domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        return session
+
+    def _fetch_http(self, session, url, title, hosts):
+        try:
+            response = session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            if _host(response.url) not in hosts:
+                # Redirected off the portal, e.g. to a login or external page
+                return None
+            return extract_post_detail(response.text, response.url, title)
+        except Exception as e:
+            logger.warning("⚠️ Could not fetch details from %s: %s", url, e)
+            return None
+
+    def fetch_http(self, session, pages, hosts):
+        """Fetch and parse several detail pages concurrently
+
+        pages maps url -> post title; returns {url: detail or None}
+        """
+        if not pages:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages))) as pool:
+            results = pool.map(lambda url: self._fetch_http(session, url, pages[url], hosts), pages)
+            return dict(zip(pages, results))
+
+    def fetch_in_tabs(self, driver, pages, hosts):
+        """Load detail pages in batches of browser tabs; returns {url: detail or None}"""
+        urls = list(pages)
+        results = {}
+        original = driver.current_window_handle
+        try:
+            for start in range(0, len(urls), self.max_workers):
+                # Open the whole batch first so the tabs load in parallel
+                opened = []
+                for url in urls[start:start + self.max_workers]:
+                    before = set(driver.window_handles)
+                    driver.execute_script("window.open(arguments[0], '_blank');", url)
+                    new_handles = set(driver.window_handles) - before
+                    if new_handles:
+                        opened.append((url, new_handles.pop()))
+
+                for url, handle in opened:
+                    driver.switch_to.window(handle)
+                    detail = None
+                    deadline = time.monotonic() + TAB_LOAD_TIMEOUT
+                    while time.monotonic() < deadline:
+                        if _host(driver.current_url) in hosts:
+                            detail = extract_post_detail(driver.page_source, driver.current_url, pages[url])
+                        if detail:
+                            break
+                        time.sleep(1)
+                    results[url] = detail
+                    driver.close()
+        finally:
+            driver.switch_to.window(original)
+        return results
+
+    def fetch(self, driver, posts, feed_urls):
+        """Full details for the given posts, keyed by title; posts without a detail page are skipped"""
+        pages = {}
+        shared = set()
+        for post in posts:
+            url = self.detail_url(post, feed_urls)
+            if not url:
+                continue
+            if url in pages:
+                # A page several posts link to is a listing, not any one post's page
+                shared.add(url)
+            pages[url] = post['title'].strip()
+        for url in shared:
+            del pages[url]
+        if not pages:
+            return {}
+
+        hosts = {_host(feed_url) for feed_url in feed_urls if feed_url}
+        details = self.fetch_http(self.session_for(driver), pages, hosts)
+        missing = {url: pages[url] for url, detail in details.items() if not detail}
+        if missing and driver is not None:
+            logger.info("🗂️ Opening %d detail page(s) in browser tabs", len(missing))
+            details.update(self.fetch_in_tabs(driver, missing, hosts))
+
+        return {pages[url]: detail for url, detail in details.items() if detail}
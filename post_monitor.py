@@ -3,6 +3,7 @@ import time
 import json
 import requests
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -12,36 +13,146 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.keys import Keys
 from dotenv import load_dotenv
 from plyer import notification
+from post_store import PostStore
+from selector_cache import SelectorCache, site_of
+from snapshot_archive import SnapshotArchive
+from coordination import coordinator_from_env
+from post_rules import RuleEngine
+from link_resolver import LinkResolver
+from post_details import DetailFetcher
+from feed_capture import FeedCapture, enable_performance_log, posts_from_payload
+from monitor_logging import get_logger, setup_logging, flush_logs
+from phase_deadlines import PhaseWatchdog, PhaseTimeout, BROWSERLESS_PHASES, deadlines_from_env, kill_process_tree
+from html_extractor import (
+    TITLE_SELECTOR, META_SELECTOR, META_SPAN_SELECTOR, PROSE_SELECTORS, extract_posts_from_html,
+    extract_posts_from_file
+)
+
+# Evaluates all fallback selectors in the page and returns only the best one's
+# deduplicated text/link records. Matches nested inside another match of the
+# same selector count against it, since they just repeat their parent's text.
+FALLBACK_EXTRACT_SCRIPT = """
+const selectors = arguments[0];
+let best = null;
+for (const selector of selectors) {
+    const nodes = Array.from(document.querySelectorAll(selector));
+    if (!nodes.length) continue;
+    const seen = new Set();
+    const records = [];
+    for (const node of nodes) {
+        const text = (node.innerText || '').trim();
+        if (text.length < 10 || seen.has(text)) continue;
+        seen.add(text);
+        const link = node.querySelector('a[href]');
+        records.push({text: text, link: link ? link.href : null});
+    }
+    const nested = nodes.filter(n => n.parentElement && n.parentElement.closest(selector)).length;
+    const score = records.length - nested;
+    if (records.length && (!best || score > best.score)) {
+        best = {selector: selector, score: score, count: nodes.length, records: records};
+    }
+}
+return best;
+"""
+
+# Returns feedHeader elements that haven't been handed out yet and marks them,
+# so streaming extraction never reads the same node twice
+UNSEEN_HEADERS_SCRIPT = """
+const headers = Array.from(document.getElementsByClassName('feedHeader'))
+    .filter(h => !h.hasAttribute('data-monitor-seen'));
+headers.forEach(h => h.setAttribute('data-monitor-seen', '1'));
+return headers;
+"""
+
+_SCROLL_DONE = object()  # Sentinel for an exhausted scroll generator
+
+PAGE_EXTENSIONS = ('.html', '.htm', '.html.gz')  # Saved pages picked up by reextract_pages
+
+logger = get_logger('post_monitor')
 
 class SupersetPostMonitor:
     def __init__(self):
         # Load environment variables from .env file
         load_dotenv('.env')
+        setup_logging()  # LOG_LEVEL, LOG_FORMAT, LOG_RATE_WINDOW, LOG_BUFFER
         
         self.username = os.getenv('SUPERSET_USERNAME')
         self.password = os.getenv('SUPERSET_PASSWORD')
         self.login_url = os.getenv('LOGIN_URL')
         self.dashboard_url = os.getenv('DASHBOARD_URL')
         self.check_interval = int(os.getenv('CHECK_INTERVAL', 300))  # Default 5 minutes
+        self.retention_days = int(os.getenv('RETENTION_DAYS', 0))  # 0 = no age limit
+        self.retention_max_posts = int(os.getenv('RETENTION_MAX_POSTS', 500))  # Posts kept in memory
+        self.snapshot_dir = os.getenv('SNAPSHOT_ARCHIVE_DIR')  # Archive every cycle's page source when set
+        self.phase_deadlines = deadlines_from_env()  # Seconds per phase, DEADLINE_<PHASE> to override
+        self.hung_driver_retries = int(os.getenv('HUNG_DRIVER_RETRIES', 1))  # Restarts after a missed deadline
+        self.rules_file = os.getenv('RULES_FILE', 'post_rules.json')  # Tagging/routing rules, optional
+        self.high_priority = int(os.getenv('HIGH_PRIORITY', 10))  # Priority that gets a louder notification
+        self.resolve_links = os.getenv('RESOLVE_LINKS', 'false').lower() in ('1', 'true', 'yes')  # Expand short links
+        self.fetch_details = os.getenv('FETCH_FULL_DETAILS', 'false').lower() in ('1', 'true', 'yes')  # Full bodies of new posts
+        self.detail_url_template = os.getenv('DETAIL_URL_TEMPLATE')  # Post page from an API post id, e.g. .../posts/{id}
+        self.feed_source = os.getenv('FEED_SOURCE', 'dom').lower()  # 'dom' or 'network' (captured API responses)
+        self.stats_every = int(os.getenv('STATS_EVERY', 12))  # Full statistics every N cycles (0 = never)
+        self.max_scroll_attempts = int(os.getenv('MAX_SCROLL_ATTEMPTS', 0))  # 0 = built-in limits (15 container, 10 page)
+        self.scroll_pause = float(os.getenv('SCROLL_PAUSE', 2))  # Seconds for new posts to load after each scroll step
         
         # Debug: Print loaded environment variables (hide password)
-        print("🔧 Environment variables loaded:")
-        print(f"   SUPERSET_USERNAME: {self.username}")
-        print(f"   SUPERSET_PASSWORD: {'*' * len(self.password) if self.password else 'None'}")
-        print(f"   LOGIN_URL: {self.login_url}")
-        print(f"   DASHBOARD_URL: {self.dashboard_url}")
-        print(f"   CHECK_INTERVAL: {self.check_interval}")
+        logger.info("🔧 Environment variables loaded:")
+        logger.info(f"   SUPERSET_USERNAME: {self.username}")
+        logger.info(f"   SUPERSET_PASSWORD: {'*' * len(self.password) if self.password else 'None'}")
+        logger.info(f"   LOGIN_URL: {self.login_url}")
+        logger.info(f"   DASHBOARD_URL: {self.dashboard_url}")
+        logger.info(f"   CHECK_INTERVAL: {self.check_interval}")
+        logger.info(f"   RETENTION_DAYS: {self.retention_days}")
+        logger.info(f"   RETENTION_MAX_POSTS: {self.retention_max_posts}")
+        logger.info(f"   SNAPSHOT_ARCHIVE_DIR: {self.snapshot_dir}")
+        logger.info(f"   RULES_FILE: {self.rules_file}")
+        logger.info(f"   RESOLVE_LINKS: {self.resolve_links}")
+        logger.info(f"   FETCH_FULL_DETAILS: {self.fetch_details}")
+        logger.info(f"   DETAIL_URL_TEMPLATE: {self.detail_url_template}")
+        logger.info(f"   FEED_SOURCE: {self.feed_source}")
+        logger.info(f"   STATS_EVERY: {self.stats_every} cycles")
+        logger.info(f"   MAX_SCROLL_ATTEMPTS: {self.max_scroll_attempts or 'default'}")
+        logger.info(f"   SCROLL_PAUSE: {self.scroll_pause:g}s")
+        logger.info(f"   PHASE DEADLINES: {', '.join(f'{k}={v:.0f}s' for k, v in self.phase_deadlines.items())}")
         
         if not self.username or not self.password:
-            print("❌ ERROR: Username or password not found in .env file!")
-            print("Please check your .env file contains SUPERSET_USERNAME and SUPERSET_PASSWORD")
+            logger.error("❌ ERROR: Username or password not found in .env file!")
+            logger.error("Please check your .env file contains SUPERSET_USERNAME and SUPERSET_PASSWORD")
         
         self.driver = None
-        self.known_posts = {}  # Changed to dict to store full post data
+        self.service = None
+        self.watchdog = PhaseWatchdog(self.phase_deadlines, on_timeout=self.handle_phase_timeout)
+        self.selector_cache = SelectorCache('selector_cache.json')
+        # Leader election and at-most-once claims when several instances share COORDINATION_DB
+        self.coordinator = coordinator_from_env(self.check_interval)
+        # Compiled once; evaluated for every new post
+        self.rules = RuleEngine.from_file(self.rules_file)
+        self.link_resolver = LinkResolver(
+            'link_cache.json',
+            ttl=int(os.getenv('LINK_CACHE_TTL', 7 * 24 * 3600)),
+            max_workers=int(os.getenv('LINK_RESOLVE_WORKERS', 8))
+        ) if self.resolve_links else None
+        self.detail_fetcher = DetailFetcher(
+            max_workers=int(os.getenv('DETAIL_FETCH_WORKERS', 4)),
+            url_template=self.detail_url_template
+        ) if self.fetch_details else None
+        self.snapshot_archive = SnapshotArchive(self.snapshot_dir) if self.snapshot_dir else None
+        self.last_compared = 0  # Posts compared in the most recent check
+        # Title -> post data; recent posts in memory, older ones archived on disk
+        self.known_posts = PostStore(
+            'known_posts.json',
+            retention_days=self.retention_days,
+            max_posts=self.retention_max_posts
+        )
         self.load_known_posts()
     
     def setup_driver(self, headless=True):
-        """Setup Chrome WebDriver with options"""
+        """Start Chrome WebDriver with options; returns (driver, service)
+        
+        Nothing is stored on the monitor here - the caller adopts the browser
+        only if it started within the driver_start deadline.
+        """
         options = webdriver.ChromeOptions()
         if headless:
             options.add_argument('--headless')  # Run in background
@@ -50,20 +161,68 @@ class SupersetPostMonitor:
         options.add_argument('--disable-blink-features=AutomationControlled')
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if self.feed_source == 'network':
+            # Buffer network events so feed API responses can be read back
+            enable_performance_log(options)
         
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        return self.driver
+        # Give chromedriver its own session so the whole browser tree can be killed if it hangs
+        popen_kw = {'start_new_session': True} if os.name != 'nt' else {}
+        service = Service(ChromeDriverManager().install(), popen_kw=popen_kw)
+        driver = webdriver.Chrome(service=service, options=options)
+        try:
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        except Exception:
+            self.discard_browser((driver, service))
+            raise
+        return driver, service
+    
+    def discard_browser(self, started):
+        """Kill a browser from setup_driver that was never adopted, e.g. one that started too late"""
+        _, service = started
+        # Killed rather than quit: quit() is a WebDriver call and could hang as well
+        process = getattr(service, 'process', None)
+        if process and process.poll() is None:
+            logger.warning("🗑️ Killing a browser the monitor is not going to use (chromedriver pid %d)", process.pid)
+            kill_process_tree(process.pid)
+    
+    def kill_browser(self):
+        """Kill chromedriver and every browser process it started"""
+        process = getattr(self.service, 'process', None) if self.service else None
+        if process and process.poll() is None:
+            logger.warning("🔪 Killing browser process tree (chromedriver pid %d)", process.pid)
+            kill_process_tree(process.pid)
+        self.driver = None
+        self.service = None
+    
+    def handle_phase_timeout(self, phase):
+        """Watchdog callback: a phase missed its deadline, so tear the browser down"""
+        logger.warning("⏱️ %s phase missed its deadline", phase, extra={'rate_key': phase})
+        if phase not in BROWSERLESS_PHASES:
+            self.kill_browser()
+    
+    def close_browser(self):
+        """Quit the browser under the driver_stop deadline, killing it if quit fails or hangs"""
+        if not self.driver:
+            return
+        try:
+            self.watchdog.run('driver_stop', self.driver.quit)
+        except Exception as e:
+            # A timeout has already killed it via handle_phase_timeout
+            if not isinstance(e, PhaseTimeout):
+                logger.warning("⚠️ Error closing browser: %s", e)
+            self.kill_browser()
+        self.driver = None
+        self.service = None
     
     def login(self):
         """Login to the Superset platform"""
         try:
-            print(f"🔐 Attempting login to {self.login_url}")
+            logger.debug("🔐 Attempting login to %s", self.login_url)
             self.driver.get(self.login_url)
             
             # Wait for login form and fill credentials
             # Try different possible selectors for email/username field
+            site = site_of(self.login_url)
             username_field = None
             selectors = [
                 (By.NAME, "email"),
@@ -74,16 +233,19 @@ class SupersetPostMonitor:
                 (By.XPATH, "//input[@placeholder*='email' or @placeholder*='Email']")
             ]
             
-            for selector_type, selector_value in selectors:
+            # Try the selector that worked last time first
+            for selector_type, selector_value in self.selector_cache.ordered(site, 'username', selectors):
                 try:
                     username_field = WebDriverWait(self.driver, 5).until(
                         EC.presence_of_element_located((selector_type, selector_value))
                     )
+                    self.selector_cache.record(site, 'username', (selector_type, selector_value))
                     break
                 except:
                     continue
             
             if not username_field:
+                self.selector_cache.record_failure(site, 'username')
                 raise Exception("Could not find username/email field")
             
             # Find password field
@@ -94,14 +256,16 @@ class SupersetPostMonitor:
                 (By.XPATH, "//input[@type='password']")
             ]
             
-            for selector_type, selector_value in password_selectors:
+            for selector_type, selector_value in self.selector_cache.ordered(site, 'password', password_selectors):
                 try:
                     password_field = self.driver.find_element(selector_type, selector_value)
+                    self.selector_cache.record(site, 'password', (selector_type, selector_value))
                     break
                 except:
                     continue
             
             if not password_field:
+                self.selector_cache.record_failure(site, 'password')
                 raise Exception("Could not find password field")
             
             # Clear fields and enter credentials
@@ -111,279 +275,367 @@ class SupersetPostMonitor:
             password_field.clear()
             password_field.send_keys(self.password)
             
-            # Submit login form - try different methods
-            try:
-                # Try finding submit button
-                login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
-                login_button.click()
-            except:
+            # Submit login form - try submit button, then button text, then Enter
+            submit_selectors = [
+                (By.XPATH, "//button[@type='submit']"),
+                (By.XPATH, "//button[contains(text(), 'Log') or contains(text(), 'Sign')]")
+            ]
+            
+            submitted = False
+            for selector_type, selector_value in self.selector_cache.ordered(site, 'submit', submit_selectors):
                 try:
-                    # Try finding login button by text
-                    login_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Log') or contains(text(), 'Sign')]")
+                    login_button = self.driver.find_element(selector_type, selector_value)
                     login_button.click()
+                    self.selector_cache.record(site, 'submit', (selector_type, selector_value))
+                    submitted = True
+                    break
                 except:
-                    # Try pressing Enter on password field
-                    password_field.send_keys(Keys.RETURN)
+                    continue
+            
+            if not submitted:
+                # Try pressing Enter on password field
+                self.selector_cache.record_failure(site, 'submit')
+                password_field.send_keys(Keys.RETURN)
             
             # Wait for successful login - check if we're redirected to dashboard
             try:
                 WebDriverWait(self.driver, 15).until(
                     lambda driver: self.dashboard_url in driver.current_url or "dashboard" in driver.current_url.lower()
                 )
-                print(f"✅ Successfully logged in and redirected to: {self.driver.current_url}")
+                logger.debug("✅ Successfully logged in and redirected to: %s", self.driver.current_url)
             except:
                 # If redirect doesn't happen automatically, try navigating manually
-                print(f"⚠️ Auto-redirect failed. Current URL: {self.driver.current_url}")
-                print("🔄 Manually navigating to dashboard...")
+                logger.warning("⚠️ Auto-redirect failed at %s, navigating to the dashboard manually",
+                               self.driver.current_url)
                 self.driver.get(self.dashboard_url)
                 time.sleep(5)
                 
                 # Check if we're now on the dashboard
                 if self.dashboard_url not in self.driver.current_url:
-                    print(f"❌ Failed to reach dashboard. Current URL: {self.driver.current_url}")
+                    logger.error("❌ Failed to reach dashboard. Current URL: %s", self.driver.current_url)
                     return False
             
-            print(f"✅ Successfully logged in at {datetime.now()}")
+            logger.debug("✅ Successfully logged in at %s", datetime.now())
             return True
             
         except Exception as e:
-            print(f"❌ Login failed: {str(e)}")
-            print(f"Current URL: {self.driver.current_url}")
+            logger.error("❌ Login failed: %s (current URL: %s)", e, self.driver.current_url)
             return False
     
-    def scroll_to_load_all_posts(self):
-        """Scroll the specific posts container to load all posts"""
-        print("📜 Scrolling posts container to load all posts...")
+    def find_scroll_container(self):
+        """Find the scrollable posts container, trying the cached selector first"""
+        container_selectors = [
+            'div.flex-grow.overflow-scroll.sm\\:mb-0',  # Exact selector with escaped colon
+            'div[class*="flex-grow"][class*="overflow-scroll"]',  # Partial match
+            'div.overflow-scroll',  # Fallback to any overflow-scroll div
+            '[class*="overflow-scroll"]'  # Most generic fallback
+        ]
+        
+        site = site_of(self.dashboard_url)
+        container_selectors = [(By.CSS_SELECTOR, selector) for selector in container_selectors]
+        
+        for selector_type, selector in self.selector_cache.ordered(site, 'scroll_container', container_selectors):
+            try:
+                scroll_container = self.driver.find_element(selector_type, selector)
+                self.selector_cache.record(site, 'scroll_container', (selector_type, selector))
+                logger.debug("✅ Found scroll container with selector: %s", selector)
+                return scroll_container
+            except:
+                continue
+        
+        self.selector_cache.record_failure(site, 'scroll_container')
+        return None
+    
+    def iter_scroll_steps(self):
+        """Scroll the posts container step by step, yielding after each step
+        
+        Yields once before the first scroll so posts that are already rendered
+        can be processed straight away.
+        """
+        logger.debug("📜 Scrolling posts container to load all posts...")
         
         try:
-            # Find the specific scrollable container
-            container_selectors = [
-                'div.flex-grow.overflow-scroll.sm\\:mb-0',  # Exact selector with escaped colon
-                'div[class*="flex-grow"][class*="overflow-scroll"]',  # Partial match
-                'div.overflow-scroll',  # Fallback to any overflow-scroll div
-                '[class*="overflow-scroll"]'  # Most generic fallback
-            ]
-            
+            scroll_container = self.find_scroll_container()
+        except Exception as e:
+            logger.warning("⚠️ Error finding scroll container: %s", e)
             scroll_container = None
-            for selector in container_selectors:
-                try:
-                    scroll_container = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    print(f"✅ Found scroll container with selector: {selector}")
-                    break
-                except:
-                    continue
-            
-            if not scroll_container:
-                print("⚠️ Scroll container not found, falling back to page scroll")
-                self.scroll_page_fallback()
-                return
-            
+        
+        if not scroll_container:
+            logger.warning("⚠️ Scroll container not found, falling back to page scroll")
+            yield from self.iter_page_scroll_steps()
+            return
+        
+        yield
+        
+        try:
             # Get initial scroll height of the container
             last_height = self.driver.execute_script("return arguments[0].scrollHeight", scroll_container)
             scroll_attempts = 0
-            max_attempts = 15  # Increased attempts for container scrolling
+            max_attempts = self.max_scroll_attempts or 15  # Increased attempts for container scrolling
             
-            print(f"📏 Initial container scroll height: {last_height}")
+            logger.debug("📏 Initial container scroll height: %s", last_height)
             
             while scroll_attempts < max_attempts:
                 # Scroll the container to bottom
                 self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scroll_container)
                 
                 # Wait for new content to load
-                time.sleep(2)
+                time.sleep(self.scroll_pause)
                 
                 # Get new scroll height of the container
                 new_height = self.driver.execute_script("return arguments[0].scrollHeight", scroll_container)
                 
                 if new_height == last_height:
-                    print(f"✅ Reached end of container after {scroll_attempts + 1} scroll attempts")
+                    logger.debug("✅ Reached end of container after %d scroll attempts", scroll_attempts + 1)
                     break
                 
                 last_height = new_height
                 scroll_attempts += 1
-                print(f"📜 Scroll attempt {scroll_attempts + 1}, container height: {new_height}")
+                logger.debug("📜 Scroll attempt %d, container height: %s", scroll_attempts + 1, new_height)
+                yield
             
             # Scroll container back to top for better visibility
             self.driver.execute_script("arguments[0].scrollTop = 0", scroll_container)
-            time.sleep(1)
+            time.sleep(self.scroll_pause / 2)
             
-            print(f"✅ Container scrolling completed after {scroll_attempts + 1} attempts")
+            logger.debug("✅ Container scrolling completed after %d attempts", scroll_attempts + 1)
             
         except Exception as e:
-            print(f"⚠️ Error scrolling container: {str(e)}")
-            print("🔄 Falling back to page scrolling...")
-            self.scroll_page_fallback()
+            logger.warning("⚠️ Error scrolling container, falling back to page scrolling: %s", e)
+            yield from self.iter_page_scroll_steps()
     
-    def scroll_page_fallback(self):
-        """Fallback method to scroll the entire page if container scrolling fails"""
-        print("📜 Using page scroll fallback...")
+    def iter_page_scroll_steps(self):
+        """Fallback that scrolls the entire page, yielding after each step"""
+        logger.debug("📜 Using page scroll fallback...")
+        yield
         
         last_height = self.driver.execute_script("return document.body.scrollHeight")
         scroll_attempts = 0
-        max_attempts = 10
+        max_attempts = self.max_scroll_attempts or 10
         
         while scroll_attempts < max_attempts:
             # Scroll down to bottom
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             
             # Wait for new content to load
-            time.sleep(3)
+            time.sleep(self.scroll_pause * 1.5)
             
             # Calculate new scroll height and compare with last scroll height
             new_height = self.driver.execute_script("return document.body.scrollHeight")
             
             if new_height == last_height:
-                print(f"✅ Reached end of page after {scroll_attempts + 1} scroll attempts")
+                logger.debug("✅ Reached end of page after %d scroll attempts", scroll_attempts + 1)
                 break
             
             last_height = new_height
             scroll_attempts += 1
-            print(f"📜 Scroll attempt {scroll_attempts + 1}, page height: {new_height}")
+            logger.debug("📜 Scroll attempt %d, page height: %s", scroll_attempts + 1, new_height)
+            yield
         
         # Scroll back to top for better visibility
         self.driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
-
-    def get_posts(self):
-        """Extract posts from the Superset platform using feedHeader structure"""
+        time.sleep(self.scroll_pause)
+    
+    def scroll_to_load_all_posts(self):
+        """Scroll the specific posts container to load all posts"""
+        for _ in self.iter_scroll_steps():
+            pass
+    
+    def scroll_page_fallback(self):
+        """Fallback method to scroll the entire page if container scrolling fails"""
+        for _ in self.iter_page_scroll_steps():
+            pass
+    
+    def take_unseen_feed_headers(self):
+        """Return feedHeader elements not handed out before, marking them as seen"""
+        return self.driver.execute_script(UNSEEN_HEADERS_SCRIPT) or []
+    
+    def parse_feed_header(self, header, index, prose_selectors):
+        """Extract one post from a feedHeader element"""
+        site = site_of(self.dashboard_url)
+        
+        # Extract post title from the p tag with specific classes
+        title_element = header.find_element(By.CSS_SELECTOR, TITLE_SELECTOR)
+        post_title = title_element.text.strip()
+        
+        # Extract author and time from the flex div
+        flex_div = header.find_element(By.CSS_SELECTOR, META_SELECTOR)
+        spans = flex_div.find_elements(By.CSS_SELECTOR, META_SPAN_SELECTOR)
+        
+        author = ""
+        post_time = ""
+        
+        if len(spans) >= 2:
+            author = spans[0].text.strip()
+            post_time = spans[1].text.strip()
+        elif len(spans) == 1:
+            # Sometimes author might be missing, so the single span is the time
+            post_time = spans[0].text.strip()
+        
+        # Extract detailed post content from prose div
+        post_details = ""
+        post_links = []
+        
         try:
-            # Navigate to dashboard if not already there
-            if self.dashboard_url not in self.driver.current_url:
-                print(f"🔄 Navigating to dashboard: {self.dashboard_url}")
-                self.driver.get(self.dashboard_url)
-                time.sleep(5)
-            
-            print(f"📍 Current URL: {self.driver.current_url}")
+            # Look for the prose div in the parent container or nearby elements
+            parent_container = header.find_element(By.XPATH, "../..")  # Go up two levels to find the full post container
             
-            # Wait for page to load and content to appear
-            print("⏳ Waiting for page content to load...")
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            # Try to find the prose div, starting with the selector that worked last
+            prose_element = None
+            for selector_type, selector in self.selector_cache.ordered(site, 'prose', prose_selectors):
+                try:
+                    prose_element = parent_container.find_element(selector_type, selector)
+                    self.selector_cache.record(site, 'prose', (selector_type, selector))
+                    break
+                except:
+                    continue
             
-            # Wait a bit more for dynamic content to load
+            if prose_element:
+                # Extract the full text content
+                post_details = prose_element.text.strip()
+                
+                # Extract all links from the prose content
+                try:
+                    link_elements = prose_element.find_elements(By.TAG_NAME, "a")
+                    for link_elem in link_elements:
+                        href = link_elem.get_attribute("href")
+                        text = link_elem.text.strip()
+                        if href:
+                            post_links.append({
+                                'url': href,
+                                'text': text
+                            })
+                except:
+                    pass
+                
+                logger.debug("📄 Extracted details for post %d (%d characters)", index + 1, len(post_details))
+            else:
+                logger.debug("⚠️ No prose content found for post %d", index + 1)
+                
+        except Exception as detail_error:
+            logger.warning("⚠️ Error extracting details for post %d: %s", index + 1, detail_error)
+        
+        # Try to find a main link in the parent container
+        main_link = self.driver.current_url
+        detail_url = ''  # Only the card's own link can lead to the post's page
+        try:
+            # Look for a link in the parent or nearby elements
+            parent = header.find_element(By.XPATH, "..")
+            link_element = parent.find_element(By.TAG_NAME, "a")
+            main_link = link_element.get_attribute("href")
+            detail_url = main_link or ''
+        except:
+            pass
+        
+        # Create unique ID based on title and time
+        post_id = hash(f"{post_title}{post_time}")
+        
+        return {
+            'title': post_title,
+            'author': author,
+            'time': post_time,
+            'details': post_details,
+            'links': post_links,
+            'main_link': main_link,
+            'detail_url': detail_url,
+            'id': post_id,
+            'found_at': datetime.now().isoformat()
+        }
+    
+    def open_dashboard(self):
+        """Navigate to the dashboard and wait for its content to render"""
+        # Navigate to dashboard if not already there
+        if self.dashboard_url not in self.driver.current_url:
+            logger.debug("🔄 Navigating to dashboard: %s", self.dashboard_url)
+            self.driver.get(self.dashboard_url)
             time.sleep(5)
-            print("✅ Page loaded, now loading all posts...")
-            
-            # Scroll to load all posts
-            self.scroll_to_load_all_posts()
+        
+        logger.debug("📍 Current URL: %s", self.driver.current_url)
+        
+        # Wait for page to load and content to appear
+        logger.debug("⏳ Waiting for page content to load...")
+        WebDriverWait(self.driver, 15).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+        
+        # Wait a bit more for dynamic content to load
+        time.sleep(5)
+    
+    def iter_post_batches(self):
+        """Yield the posts rendered by each scroll step as soon as they appear
+        
+        Each feedHeader is marked in the page when it is read, so no node is
+        parsed twice no matter how many scroll steps it stays rendered for.
+        """
+        try:
+            self.watchdog.run('navigate', self.open_dashboard)
+            logger.debug("✅ Page loaded, now streaming posts while scrolling...")
             
-            current_posts = []
+            prose_selectors = [(By.CSS_SELECTOR, selector) for selector in PROSE_SELECTORS]
+            parsed_count = 0
             
-            # Look specifically for feedHeader divs
-            try:
-                feed_headers = self.driver.find_elements(By.CLASS_NAME, "feedHeader")
-                print(f"📋 Found {len(feed_headers)} feedHeader elements")
+            def take_batch():
+                nonlocal parsed_count
+                batch = []
+                try:
+                    feed_headers = self.take_unseen_feed_headers()
+                except Exception as e:
+                    logger.warning("⚠️ Error finding feedHeader elements: %s", e)
+                    return batch
                 
-                for i, header in enumerate(feed_headers):
+                for header in feed_headers:
                     try:
-                        # Extract post title from the p tag with specific classes
-                        title_element = header.find_element(By.CSS_SELECTOR, "p.text-base.font-bold.text-dark")
-                        post_title = title_element.text.strip()
-                        
-                        # Extract author and time from the flex div
-                        flex_div = header.find_element(By.CSS_SELECTOR, "div.flex.mt-1.flex-wrap")
-                        spans = flex_div.find_elements(By.CSS_SELECTOR, "span.text-gray-500.text-xs")
-                        
-                        author = ""
-                        post_time = ""
-                        
-                        if len(spans) >= 2:
-                            author = spans[0].text.strip()
-                            post_time = spans[1].text.strip()
-                        elif len(spans) == 1:
-                            # Sometimes author might be missing, so the single span is the time
-                            post_time = spans[0].text.strip()
-                        
-                        # Extract detailed post content from prose div
-                        post_details = ""
-                        post_links = []
-                        
-                        try:
-                            # Look for the prose div in the parent container or nearby elements
-                            parent_container = header.find_element(By.XPATH, "../..")  # Go up two levels to find the full post container
-                            
-                            # Try to find the prose div
-                            prose_selectors = [
-                                'div.prose',
-                                'div[class*="prose"]',
-                                'div p.text-sm.text-gray-600',
-                                'div[class*="text-gray-600"]'
-                            ]
-                            
-                            prose_element = None
-                            for selector in prose_selectors:
-                                try:
-                                    prose_element = parent_container.find_element(By.CSS_SELECTOR, selector)
-                                    break
-                                except:
-                                    continue
-                            
-                            if prose_element:
-                                # Extract the full text content
-                                post_details = prose_element.text.strip()
-                                
-                                # Extract all links from the prose content
-                                try:
-                                    link_elements = prose_element.find_elements(By.TAG_NAME, "a")
-                                    for link_elem in link_elements:
-                                        href = link_elem.get_attribute("href")
-                                        text = link_elem.text.strip()
-                                        if href:
-                                            post_links.append({
-                                                'url': href,
-                                                'text': text
-                                            })
-                                except:
-                                    pass
-                                
-                                print(f"📄 Extracted details for post {i+1} ({len(post_details)} characters)")
-                            else:
-                                print(f"⚠️ No prose content found for post {i+1}")
-                                
-                        except Exception as detail_error:
-                            print(f"⚠️ Error extracting details for post {i+1}: {str(detail_error)}")
-                        
-                        # Try to find a main link in the parent container
-                        main_link = self.driver.current_url
-                        try:
-                            # Look for a link in the parent or nearby elements
-                            parent = header.find_element(By.XPATH, "..")
-                            link_element = parent.find_element(By.TAG_NAME, "a")
-                            main_link = link_element.get_attribute("href")
-                        except:
-                            pass
-                        
-                        # Create unique ID based on title and time
-                        post_id = hash(f"{post_title}{post_time}")
-                        
-                        post_data = {
-                            'title': post_title,
-                            'author': author,
-                            'time': post_time,
-                            'details': post_details,
-                            'links': post_links,
-                            'main_link': main_link,
-                            'id': post_id,
-                            'found_at': datetime.now().isoformat()
-                        }
-                        
-                        current_posts.append(post_data)
-                        print(f"✅ Parsed post {i+1}: {post_title[:50]}... ({len(post_details)} chars details)")
-                        
+                        post_data = self.parse_feed_header(header, parsed_count, prose_selectors)
+                        batch.append(post_data)
+                        logger.debug("✅ Parsed post %d: %s... (%d chars details)",
+                                     parsed_count + 1, post_data['title'][:50], len(post_data['details']))
                     except Exception as e:
-                        print(f"⚠️ Error parsing feedHeader {i}: {str(e)}")
-                        continue
-                
-                if len(current_posts) > 0:
-                    print(f"📊 Successfully extracted {len(current_posts)} posts from feedHeader elements")
-                    return current_posts
-                    
-            except Exception as e:
-                print(f"⚠️ Error finding feedHeader elements: {str(e)}")
+                        logger.warning("⚠️ Error parsing feedHeader %d: %s", parsed_count, e)
+                    parsed_count += 1
+                return batch
+            
+            # In network mode posts come from the feed's API responses, not the DOM
+            capture = None
+            next_batch = take_batch
+            if self.feed_source == 'network':
+                capture = FeedCapture(
+                    self.driver, self.watchdog.run('navigate', lambda: self.driver.current_url),
+                    on_payload=self.archive_payload if self.snapshot_archive else None
+                )
+                next_batch = capture.take_batch
+            
+            # Every scroll step and every extraction runs under its phase deadline
+            posts_found = 0
+            steps = self.iter_scroll_steps()
+            while self.watchdog.run('scroll', next, steps, _SCROLL_DONE) is not _SCROLL_DONE:
+                batch = self.watchdog.run('extract', next_batch)
+                if batch:
+                    posts_found += len(batch)
+                    yield batch
+            
+            # Pick up anything rendered after the last scroll step
+            batch = self.watchdog.run('extract', next_batch)
+            if batch:
+                posts_found += len(batch)
+                yield batch
+            
+            if capture:
+                logger.debug("📡 Captured %d posts from %d feed responses", capture.posts, capture.responses)
+                if not capture.posts:
+                    logger.warning("⚠️ No feed responses captured, reading the rendered posts instead")
+                    batch = self.watchdog.run('extract', take_batch)
+                    if batch:
+                        posts_found += len(batch)
+                        yield batch
+            
+            self.watchdog.run('extract', self.archive_snapshot)
+            
+            if posts_found > 0:
+                logger.debug("📊 Successfully extracted %d posts from feedHeader elements", posts_found)
+                return
             
             # Fallback: if feedHeader approach fails, try generic selectors
-            print("🔄 Trying fallback selectors...")
+            logger.warning("🔄 No feedHeader posts found, trying fallback selectors...")
             fallback_selectors = [
                 "div[class*='feed']",
                 "div[class*='post']",
@@ -391,83 +643,152 @@ class SupersetPostMonitor:
                 "article"
             ]
             
-            for selector in fallback_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements and len(elements) > 0:
-                        print(f"📋 Found {len(elements)} elements with fallback selector: {selector}")
-                        
-                        for i, element in enumerate(elements):
-                            try:
-                                element_text = element.text.strip()
-                                if not element_text or len(element_text) < 10:
-                                    continue
-                                
-                                # Try to find a link
-                                link = self.driver.current_url
-                                try:
-                                    link_element = element.find_element(By.TAG_NAME, "a")
-                                    link = link_element.get_attribute("href")
-                                except:
-                                    pass
-                                
-                                # Create basic post data
-                                post_id = hash(element_text[:100])
-                                title_lines = element_text.split('\n')
-                                title = title_lines[0][:100] if title_lines else element_text[:50]
-                                
-                                post_data = {
-                                    'title': title,
-                                    'author': 'Unknown',
-                                    'time': 'Unknown',
-                                    'content': element_text,
-                                    'link': link,
-                                    'id': post_id,
-                                    'found_at': datetime.now().isoformat()
-                                }
-                                current_posts.append(post_data)
-                                
-                            except Exception as e:
-                                print(f"⚠️ Error parsing fallback element {i}: {str(e)}")
-                                continue
-                        
-                        if len(current_posts) > 0:
-                            break
-                            
-                except Exception as e:
-                    continue
+            # Score every candidate in one round-trip instead of reading each element
+            best = None
+            try:
+                best = self.watchdog.run('extract', self.driver.execute_script,
+                                         FALLBACK_EXTRACT_SCRIPT, fallback_selectors)
+            except PhaseTimeout:
+                raise
+            except Exception as e:
+                logger.warning("⚠️ Error running fallback extraction script: %s", e)
+            
+            fallback_posts = []
+            if best:
+                logger.info("📋 Fallback selector %s matched %d elements (%d unique posts)",
+                            best['selector'], best['count'], len(best['records']))
+                
+                for record in best['records']:
+                    element_text = record['text']
+                    
+                    # Create basic post data
+                    post_id = hash(element_text[:100])
+                    title_lines = element_text.split('\n')
+                    title = title_lines[0][:100] if title_lines else element_text[:50]
+                    
+                    post_data = {
+                        'title': title,
+                        'author': 'Unknown',
+                        'time': 'Unknown',
+                        'content': element_text,
+                        'link': record['link'] or self.driver.current_url,
+                        'id': post_id,
+                        'found_at': datetime.now().isoformat()
+                    }
+                    fallback_posts.append(post_data)
             
             # If still no posts found, save page source for debugging
-            if len(current_posts) == 0:
-                print("⚠️ No posts found with any selector. Saving page source for debugging...")
+            if len(fallback_posts) == 0:
+                logger.warning("⚠️ No posts found with any selector. Saving page source for debugging...")
+                page_source = self.watchdog.run('extract', lambda: self.driver.page_source)
                 with open('page_source_debug.html', 'w', encoding='utf-8') as f:
-                    f.write(self.driver.page_source)
-                print("💾 Saved page source to page_source_debug.html for inspection")
-            
-            print(f"📊 Total posts found: {len(current_posts)}")
-            return current_posts
+                    f.write(page_source)
+                logger.info("💾 Saved page source to page_source_debug.html for inspection")
+            else:
+                logger.info("📊 Total posts found: %d", len(fallback_posts))
+                yield fallback_posts
             
+        except PhaseTimeout:
+            raise
         except Exception as e:
-            print(f"❌ Error getting posts: {str(e)}")
-            return []
+            logger.error("❌ Error getting posts: %s", e)
     
-    def check_new_posts(self):
-        """Check for new posts by comparing titles with stored posts"""
-        current_posts = self.get_posts()
+    def iter_posts(self):
+        """Yield posts one at a time while the feed is being scrolled"""
+        for batch in self.iter_post_batches():
+            yield from batch
+    
+    def get_posts(self):
+        """Extract posts from the Superset platform using feedHeader structure"""
+        return list(self.iter_posts())
+    
+    def archive_snapshot(self):
+        """Store the current page source in the snapshot archive, if enabled"""
+        if not self.snapshot_archive:
+            return
+        try:
+            digest, is_new = self.snapshot_archive.store(self.driver.page_source, 'html', self.driver.current_url)
+            logger.debug("🗄️ Archived page snapshot %s (%s)", digest[:12], 'new' if is_new else 'unchanged')
+        except Exception as e:
+            logger.warning("⚠️ Error archiving page snapshot: %s", e)
+    
+    def archive_payload(self, url, body):
+        """Store a captured feed response in the snapshot archive"""
+        try:
+            digest, is_new = self.snapshot_archive.store(body, 'json', url)
+            if is_new:
+                logger.debug("🗄️ Archived feed response %s", digest[:12])
+        except Exception as e:
+            logger.warning("⚠️ Error archiving feed response: %s", e)
+    
+    def check_new_posts(self, current_posts=None, dry_run=False, on_new_posts=None):
+        """Check for new posts by comparing titles with stored posts
+        
+        Scrapes the dashboard unless current_posts is given. Scraped posts are
+        diffed and notified batch by batch while the feed is still scrolling,
+        so a new post at the top is reported without waiting for the full
+        scroll. A dry run only updates known_posts - no notifications, log
+        entries or saving. When on_new_posts is given, each batch of new posts
+        is handed to it instead and saving is left to the caller; a batch whose
+        posts were all suppressed or claimed elsewhere is handed over empty so
+        the caller still saves it, as is an empty one once link targets have
+        been resolved for posts already handed over.
+        """
+        batches = [current_posts] if current_posts is not None else self.iter_post_batches()
         new_posts = []
         
-        print(f"🔍 Comparing {len(current_posts)} current posts with {len(self.known_posts)} known posts...")
+        logger.debug("🔍 Comparing current posts with %d known posts...", self.known_posts.total_count)
         
-        for post in current_posts:
-            post_title = post['title'].strip()
+        try:
+            self._diff_batches(batches, new_posts, dry_run, on_new_posts)
+        finally:
+            # Posts already notified must be saved even if the scrape was cut short
+            if new_posts and not dry_run and not on_new_posts:
+                self.save_known_posts()
+        
+        if not new_posts:
+            logger.debug("ℹ️ No new posts found this time")
+        
+        return new_posts
+    
+    def _diff_batches(self, batches, new_posts, dry_run, on_new_posts):
+        """Diff each batch against known_posts and dispatch the new ones"""
+        compared = 0
+        for batch in batches:
+            batch_new = []
+            batch_titles = set()
+            for post in batch:
+                compared += 1
+                post_title = post['title'].strip()
+                
+                # Check if this title already exists in known posts
+                title_exists = post_title in self.known_posts or post_title in batch_titles
+                
+                if not title_exists:
+                    batch_new.append(post)
+                    batch_titles.add(post_title)
+                else:
+                    logger.debug("✅ Known post: %s...", post_title[:50])
+            
+            # Claim before doing any work on them: posts another instance has
+            # already handled are only remembered, never enriched or notified again
+            claimed = batch_new
+            if batch_new and not dry_run:
+                claimed = self.coordinator.claim_posts(batch_new)
+                if len(claimed) < len(batch_new):
+                    logger.info("🤝 %d post(s) already handled by another instance", len(batch_new) - len(claimed))
+            claimed_titles = {post['title'].strip() for post in claimed}
             
-            # Check if this title already exists in known posts
-            title_exists = post_title in self.known_posts
+            # Only new posts get their full body fetched, before rules see them
+            if claimed and self.detail_fetcher and not dry_run:
+                # Browser tabs can hang like any other WebDriver call
+                self.watchdog.run('details', self.fetch_full_details, claimed)
             
-            if not title_exists:
-                new_posts.append(post)
+            for post in batch_new:
+                post_title = post['title'].strip()
+                result = self.rules.apply(post)
                 # Store the full post data with title as key
-                self.known_posts[post_title] = {
+                record = {
                     'title': post_title,
                     'author': post.get('author', ''),
                     'time': post.get('time', ''),
@@ -476,31 +797,212 @@ class SupersetPostMonitor:
                     'main_link': post.get('main_link', ''),
                     'first_seen': datetime.now().isoformat()
                 }
-                print(f"🆕 NEW POST DETECTED: {post_title}")
-            else:
-                print(f"✅ Known post: {post_title[:50]}...")
+                if post.get('attachments'):
+                    record['attachments'] = post['attachments']
+                if result.matched:
+                    record['tags'] = result.tags
+                    record['priority'] = result.priority
+                self.known_posts[post_title] = record
+                if post_title not in claimed_titles:
+                    logger.debug("🤝 Seen by another instance: %s...", post_title[:50])
+                    continue
+                logger.info("🆕 NEW POST DETECTED: %s", post_title, extra={'event': 'new_post', 'title': post_title})
+                if result.matched:
+                    logger.info("   📐 Rules: %s • priority %d%s", ', '.join(result.matched), result.priority,
+                                ' • suppressed' if result.suppressed else '')
+            
+            if batch_new:
+                if claimed:
+                    logger.info("🎉 FOUND %d NEW POSTS! 🎉", len(claimed))
+                
+                if not dry_run:
+                    # Highest priority first; suppressed posts are remembered but not notified
+                    to_notify = sorted(
+                        (post for post in claimed if not post.get('suppressed')),
+                        key=lambda post: post.get('priority', 0),
+                        reverse=True
+                    )
+                    if len(to_notify) < len(claimed):
+                        logger.info("🔕 %d post(s) suppressed by rules", len(claimed) - len(to_notify))
+                    
+                    if on_new_posts:
+                        on_new_posts(to_notify)
+                    elif to_notify:
+                        self.notify_new_posts(to_notify)
+                new_posts.extend(batch_new)
+            
+            # Resolving links waits on outside servers, so it comes after the
+            # notifications; the targets are stored with the posts for later
+            if claimed and self.link_resolver and not dry_run:
+                try:
+                    expanded = self.watchdog.run('links', self.expand_links, claimed)
+                except PhaseTimeout as e:
+                    # Only outside servers were slow; the scrape itself can carry on
+                    logger.warning("⏱️ %s", e, extra={'rate_key': e.phase})
+                else:
+                    if expanded and on_new_posts:
+                        # The batch may already be saved; an empty one gets the targets saved too
+                        on_new_posts([])
+        
+        self.last_compared = compared
+        logger.debug("🔍 Compared %d current posts", compared)
+    
+    def fetch_full_details(self, posts):
+        """Replace the feed previews of new posts with the full body from their detail pages"""
+        started = time.perf_counter()
+        try:
+            details = self.detail_fetcher.fetch(self.driver, posts, [self.dashboard_url, self.login_url])
+        except Exception as e:
+            logger.warning("⚠️ Error fetching full post details: %s", e)
+            return
+        
+        completed = 0
+        for post in posts:
+            detail = details.get(post['title'].strip())
+            # Keep the preview if the detail page somehow has less to say
+            if not detail or len(detail['details']) < len(post.get('details', '')):
+                continue
+            post['details'] = detail['details']
+            post['links'] = detail['links'] or post.get('links', [])
+            if detail['attachments']:
+                post['attachments'] = detail['attachments']
+            completed += 1
         
-        if new_posts:
-            print(f"\n🎉 FOUND {len(new_posts)} NEW POSTS! 🎉")
-            print("=" * 60)
-            for i, post in enumerate(new_posts, 1):
-                print(f"{i}. {post['title']}")
-            print("=" * 60)
+        if completed:
+            logger.info("📄 Fetched full details for %d/%d new post(s) in %.1fs",
+                        completed, len(posts), time.perf_counter() - started)
+    
+    def expand_links(self, posts):
+        """Resolve shortened/redirecting links in new posts and store the targets; returns how many"""
+        try:
+            expanded = self.link_resolver.enrich_posts(posts)
+        except Exception as e:
+            logger.warning("⚠️ Error resolving links: %s", e)
+            return 0
+        
+        if expanded:
+            logger.info("🔗 Expanded %d redirecting link(s)", expanded)
+            for post in posts:
+                stored = self.known_posts.get(post['title'].strip())
+                if stored is not None and post.get('links'):
+                    with self.known_posts.lock:
+                        stored.set_links(post['links'])
+        return expanded
+    
+    def replay_snapshots(self, directory):
+        """Feed archived snapshots through extraction and diffing without a browser
+        
+        Starts from an empty known-posts store so the real one is never touched.
+        """
+        archive = SnapshotArchive(directory)
+        self.known_posts = PostStore(os.path.join(directory, 'replay_known_posts.json'))
+        
+        snapshots = 0
+        total_posts = 0
+        total_new = 0
+        started = time.perf_counter()
+        
+        for entry, content in archive.iter_snapshots():
+            cycle_start = time.perf_counter()
+            page_url = entry.get('url') or self.dashboard_url or ''
+            if entry['kind'] == 'html':
+                posts = extract_posts_from_html(content, page_url)
+            elif entry['kind'] == 'json':
+                posts = posts_from_payload(json.loads(content), self.dashboard_url or page_url)
+            else:
+                continue
+            new_posts = self.check_new_posts(current_posts=posts, dry_run=True)
+            elapsed = time.perf_counter() - cycle_start
             
-            self.notify_new_posts(new_posts)
-            self.save_known_posts()
-        else:
-            print("ℹ️ No new posts found this time")
+            snapshots += 1
+            total_posts += len(posts)
+            total_new += len(new_posts)
+            logger.info("🔁 %s %s: %d posts, %d new (%.1f ms)", entry['captured_at'], entry['digest'][:12],
+                        len(posts), len(new_posts), elapsed * 1000)
         
-        return new_posts
+        elapsed = time.perf_counter() - started
+        logger.info("📊 Replayed %d snapshots, %d posts, %d new in %.2fs", snapshots, total_posts, total_new, elapsed)
+        if elapsed > 0:
+            logger.info("   %.1f snapshots/s • %.1f posts/s", snapshots / elapsed, total_posts / elapsed)
+        return total_new
     
-    def notify_new_posts(self, new_posts):
+    def reextract_pages(self, directory, workers=None):
+        """Rebuild post history from a directory of saved HTML pages
+        
+        Pages are parsed with the feedHeader rules on a process pool. Posts are
+        deduplicated by title, keeping the longest details and the earliest
+        page time, then upserted into known_posts in one pass and saved once.
+        """
+        paths = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(directory)
+            for name in names
+            if name.lower().endswith(PAGE_EXTENSIONS)
+        )
+        if not paths:
+            logger.warning("⚠️ No saved pages (%s) found in %s", ', '.join(PAGE_EXTENSIONS), directory)
+            return 0
+        
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        logger.info("🔁 Re-extracting %d page(s) from %s on %d worker process(es)...", len(paths), directory, workers)
+        
+        merged = {}
+        pages = total_posts = total_bytes = failed = 0
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(extract_posts_from_file, path, self.dashboard_url or '') for path in paths]
+            for future in as_completed(futures):
+                try:
+                    path, size, posts = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.warning("⚠️ Could not re-extract a page: %s", e)
+                    continue
+                
+                pages += 1
+                total_bytes += size
+                total_posts += len(posts)
+                # A page was saved no later than its file was last written
+                page_time = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+                for post in posts:
+                    title = post['title'].strip()
+                    current = merged.get(title)
+                    first_seen = min(page_time, current['first_seen']) if current else page_time
+                    if current is None or len(post.get('details', '')) > len(current['details']):
+                        merged[title] = {
+                            'title': title,
+                            'author': post.get('author', ''),
+                            'time': post.get('time', ''),
+                            'details': post.get('details', ''),
+                            'links': post.get('links', []),
+                            'main_link': post.get('main_link', ''),
+                            'first_seen': first_seen
+                        }
+                    else:
+                        current['first_seen'] = first_seen
+        extracted = time.perf_counter() - started
+        
+        inserted, updated = self.known_posts.upsert_many(merged)
+        self.save_known_posts()
+        elapsed = time.perf_counter() - started
+        
+        logger.info("📊 Re-extracted %d pages (%d failed): %d posts, %d unique, %d inserted, %d updated",
+                    pages, failed, total_posts, len(merged), inserted, updated,
+                    extra={'event': 'reextract', 'pages': pages, 'failed': failed, 'posts': total_posts,
+                           'unique': len(merged), 'inserted': inserted, 'updated': updated})
+        if extracted > 0:
+            logger.info("   %.1f pages/s • %.1f posts/s • %.1f MB/s extraction, %.2fs total including save",
+                        pages / extracted, total_posts / extracted, total_bytes / extracted / 1e6, elapsed)
+        return inserted
+    
+    def notify_new_posts(self, new_posts, log=True):
         """Send notifications for new posts"""
-        print(f"\n🔔 {len(new_posts)} new post(s) found!")
+        logger.info("🔔 %d new post(s) found!", len(new_posts))
         
         # Send desktop notification
         try:
-            print("📱 Attempting to send desktop notification...")
+            logger.debug("📱 Attempting to send desktop notification...")
+            urgent = any(post.get('priority', 0) >= self.high_priority for post in new_posts)
             if len(new_posts) == 1:
                 post = new_posts[0]
                 message = f"{post['title'][:60]}..."
@@ -508,111 +1010,159 @@ class SupersetPostMonitor:
                     message += f"\nBy: {post['author']}"
                 if post.get('time'):
                     message += f" • {post['time']}"
+                if post.get('tags'):
+                    message += f"\nTags: {', '.join(post['tags'])}"
                 
                 notification.notify(
-                    title="New Superset Post!",
+                    title="🔥 High Priority Superset Post!" if urgent else "New Superset Post!",
                     message=message,
                     timeout=10
                 )
-                print("✅ Desktop notification sent successfully!")
+                logger.debug("✅ Desktop notification sent successfully!")
             else:
                 notification.notify(
-                    title="New Superset Posts!",
+                    title="🔥 New Superset Posts (high priority)!" if urgent else "New Superset Posts!",
                     message=f"{len(new_posts)} new posts found. Check the log for details.",
                     timeout=10
                 )
-                print("✅ Desktop notification sent successfully!")
+                logger.debug("✅ Desktop notification sent successfully!")
         except Exception as e:
-            print(f"⚠️ Desktop notification failed: {str(e)}")
-            print("💡 You may need to install notification dependencies or check system permissions")
+            logger.warning("⚠️ Desktop notification failed: %s (you may need to install notification "
+                           "dependencies or check system permissions)", e)
         
         for post in new_posts:
-            print(f"📝 Title: {post['title']}")
+            # One record per post so JSON output keeps each post's fields together
+            lines = [f"📝 Title: {post['title']}"]
             if post.get('author'):
-                print(f"👤 Author: {post['author']}")
+                lines.append(f"👤 Author: {post['author']}")
             if post.get('time'):
-                print(f"⏰ Posted: {post['time']}")
+                lines.append(f"⏰ Posted: {post['time']}")
+            if post.get('tags'):
+                lines.append(f"🏷️ Tags: {', '.join(post['tags'])} (priority {post.get('priority', 0)})")
             if post.get('details'):
-                print(f"📄 Details: {post['details'][:200]}{'...' if len(post['details']) > 200 else ''}")
+                lines.append(f"📄 Details: {post['details'][:200]}{'...' if len(post['details']) > 200 else ''}")
             if post.get('links'):
-                print(f"🔗 Links found: {len(post['links'])}")
+                lines.append(f"🔗 Links found: {len(post['links'])}")
                 for i, link in enumerate(post['links'][:3], 1):  # Show first 3 links
-                    print(f"   {i}. {link['text']}: {link['url']}")
+                    lines.append(f"   {i}. {link['text']}: {link['url']}")
+                    if link.get('resolved'):
+                        lines.append(f"      ↪ {link['resolved']}")
                 if len(post['links']) > 3:
-                    print(f"   ... and {len(post['links']) - 3} more links")
-            print(f"📅 Found at: {post['found_at']}")
+                    lines.append(f"   ... and {len(post['links']) - 3} more links")
+            if post.get('attachments'):
+                lines.append(f"📎 Attachments: {', '.join(a['name'] for a in post['attachments'])}")
+            lines.append(f"📅 Found at: {post['found_at']}")
             if post.get('main_link'):
-                print(f"🔗 Main Link: {post['main_link']}")
-            print("-" * 50)
+                lines.append(f"🔗 Main Link: {post['main_link']}")
+            lines.append("-" * 50)
+            logger.info('\n'.join(lines), extra={
+                'event': 'notify', 'title': post['title'], 'priority': post.get('priority', 0)
+            })
         
         # Log to file
-        self.log_new_posts(new_posts)
+        if log:
+            self.log_new_posts(new_posts)
     
     def log_new_posts(self, new_posts):
-        """Log new posts to file with detailed information"""
+        """Log new posts to file with detailed information
+        
+        Posts routed by a rule are also appended to that route's log file.
+        """
+        routed = {}
         with open('new_posts.log', 'a', encoding='utf-8') as f:
             for post in new_posts:
-                f.write(f"\n{'='*80}\n")
-                f.write(f"NEW POST FOUND: {datetime.now()}\n")
-                f.write(f"{'='*80}\n")
-                f.write(f"Title: {post['title']}\n")
-                
-                if post.get('author'):
-                    f.write(f"Author: {post['author']}\n")
-                if post.get('time'):
-                    f.write(f"Posted: {post['time']}\n")
-                
-                if post.get('details'):
-                    f.write(f"\nDetails:\n{post['details']}\n")
-                
-                if post.get('links'):
-                    f.write(f"\nLinks found ({len(post['links'])}):\n")
-                    for i, link in enumerate(post['links'], 1):
-                        f.write(f"  {i}. {link['text']}: {link['url']}\n")
-                
-                if post.get('main_link'):
-                    f.write(f"\nMain Link: {post['main_link']}\n")
-                
-                f.write(f"Found at: {post['found_at']}\n")
-                f.write(f"{'='*80}\n\n")
+                self.write_log_entry(f, post)
+                for route in post.get('routes', []):
+                    if route in self.rules.routes:
+                        routed.setdefault(self.rules.routes[route], []).append(post)
+        
+        for path, posts in routed.items():
+            try:
+                if os.path.dirname(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as f:
+                    for post in posts:
+                        self.write_log_entry(f, post)
+            except Exception as e:
+                logger.warning("⚠️ Error writing route log %s: %s", path, e)
+    
+    def write_log_entry(self, f, post):
+        """Write one post's log entry to an open file"""
+        f.write(f"\n{'='*80}\n")
+        f.write(f"NEW POST FOUND: {datetime.now()}\n")
+        f.write(f"{'='*80}\n")
+        f.write(f"Title: {post['title']}\n")
+        
+        if post.get('author'):
+            f.write(f"Author: {post['author']}\n")
+        if post.get('time'):
+            f.write(f"Posted: {post['time']}\n")
+        if post.get('tags'):
+            f.write(f"Tags: {', '.join(post['tags'])} (priority {post.get('priority', 0)})\n")
+        
+        if post.get('details'):
+            f.write(f"\nDetails:\n{post['details']}\n")
+        
+        if post.get('links'):
+            f.write(f"\nLinks found ({len(post['links'])}):\n")
+            for i, link in enumerate(post['links'], 1):
+                f.write(f"  {i}. {link['text']}: {link['url']}\n")
+                if link.get('resolved'):
+                    f.write(f"     -> {link['resolved']}\n")
+        
+        if post.get('attachments'):
+            f.write(f"\nAttachments ({len(post['attachments'])}):\n")
+            for i, attachment in enumerate(post['attachments'], 1):
+                f.write(f"  {i}. {attachment['name']}: {attachment['url']}\n")
+        
+        if post.get('main_link'):
+            f.write(f"\nMain Link: {post['main_link']}\n")
+        
+        f.write(f"Found at: {post['found_at']}\n")
+        f.write(f"{'='*80}\n\n")
     
     def load_known_posts(self):
         """Load previously seen posts from file"""
         try:
-            with open('known_posts.json', 'r', encoding='utf-8') as f:
-                self.known_posts = json.load(f)
-                if not isinstance(self.known_posts, dict):
-                    # Handle old format (set/list) by converting to dict
-                    self.known_posts = {}
+            self.known_posts.load()
         except FileNotFoundError:
-            self.known_posts = {}
-        except json.JSONDecodeError:
-            print("⚠️ Error reading known_posts.json, starting fresh")
-            self.known_posts = {}
+            self.known_posts.clear()
+        except (json.JSONDecodeError, KeyError, IndexError, ValueError):
+            logger.warning("⚠️ Error reading known_posts.json, starting fresh")
+            self.known_posts.clear()
     
     def save_known_posts(self):
         """Save known posts to file"""
         try:
-            with open('known_posts.json', 'w', encoding='utf-8') as f:
-                json.dump(self.known_posts, f, indent=2, ensure_ascii=False)
-            print(f"💾 Saved {len(self.known_posts)} known posts to file")
+            self.known_posts.save()
+            logger.debug("💾 Saved %d known posts to file (%d archived)", len(self.known_posts), self.known_posts.archived_count)
         except Exception as e:
-            print(f"⚠️ Error saving known posts: {str(e)}")
+            logger.error("⚠️ Error saving known posts: %s", e)
     
     def show_statistics(self):
-        """Show statistics about stored posts"""
-        print(f"\n📊 Post Statistics:")
-        print(f"   Total known posts: {len(self.known_posts)}")
+        """Log statistics about stored posts"""
+        logger.info(self.format_statistics(), extra={'event': 'statistics'})
+    
+    def format_statistics(self):
+        """Statistics about stored posts as text"""
+        # In async mode this runs on the log thread while saves evict posts on another
+        with self.known_posts.lock:
+            return self._format_statistics()
+    
+    def _format_statistics(self):
+        lines = ["📊 Post Statistics:"]
+        lines.append(f"   Total known posts: {self.known_posts.total_count}")
+        lines.append(f"   In memory: {len(self.known_posts)} • Archived: {self.known_posts.archived_count}")
         
         if len(self.known_posts) > 0:
             # Count posts with details and links
-            posts_with_details = sum(1 for data in self.known_posts.values() if data.get('details'))
+            posts_with_details = sum(1 for data in self.known_posts.values() if data.details_length)
             posts_with_links = sum(1 for data in self.known_posts.values() if data.get('links'))
             total_links = sum(len(data.get('links', [])) for data in self.known_posts.values())
             
-            print(f"   Posts with details: {posts_with_details}")
-            print(f"   Posts with links: {posts_with_links}")
-            print(f"   Total links found: {total_links}")
+            lines.append(f"   Posts with details: {posts_with_details}")
+            lines.append(f"   Posts with links: {posts_with_links}")
+            lines.append(f"   Total links found: {total_links}")
             
             # Show most recent posts - sort by actual post time, not discovery time
             def parse_time_ago(time_str):
@@ -654,56 +1204,109 @@ class SupersetPostMonitor:
                 reverse=False  # False because smaller time_ago means more recent
             )[:3]
             
-            print(f"   Most recent posts:")
+            lines.append("   Most recent posts:")
             for i, (title, data) in enumerate(recent_posts, 1):
                 author = data.get('author', 'Unknown')
                 time_posted = data.get('time', 'Unknown')
-                details_length = len(data.get('details', ''))
+                details_length = data.details_length
                 links_count = len(data.get('links', []))
                 first_seen = data.get('first_seen', 'Unknown')
                 
-                print(f"     {i}. {title[:50]}...")
-                print(f"        By: {author} • {time_posted}")
-                print(f"        First seen: {first_seen}")
+                lines.append(f"     {i}. {title[:50]}...")
+                lines.append(f"        By: {author} • {time_posted}")
+                lines.append(f"        First seen: {first_seen}")
                 if details_length > 0:
-                    print(f"        Details: {details_length} characters")
+                    lines.append(f"        Details: {details_length} characters")
                 if links_count > 0:
-                    print(f"        Links: {links_count} found")
-        print()
-    
-    def run_once(self, headless=True):
-        """Run a single check"""
-        if not self.setup_driver(headless=headless):
-            return False
+                    lines.append(f"        Links: {links_count} found")
         
+        cache_stats = self.selector_cache.stats()
+        if cache_stats['hits'] or cache_stats['misses']:
+            lines.append(f"   Selector cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.0%} hit rate)")
+        
+        latency = self.watchdog.latency_summary()
+        if latency:
+            lines.append("   Phase latency (p50 / p95 / p99 / max):")
+            for phase, stats in latency.items():
+                timeouts = f" • {stats['timeouts']} timeouts" if stats['timeouts'] else ""
+                lines.append(f"     {phase}: {stats['p50']:.1f}s / {stats['p95']:.1f}s / "
+                      f"{stats['p99']:.1f}s / {stats['max']:.1f}s{timeouts}")
+        for event in list(self.watchdog.events)[-3:]:
+            lines.append(f"   ⏱️ {event['at']}: {event['phase']} missed its {event['deadline']:g}s deadline")
+        return '\n'.join(lines)
+    
+    def run_once(self, headless=True, on_new_posts=None):
+        """Run a single check, restarting the browser if a phase misses its deadline"""
+        for attempt in range(self.hung_driver_retries + 1):
+            try:
+                return self._run_cycle(headless, on_new_posts)
+            except PhaseTimeout as e:
+                logger.warning("⏱️ %s", e, extra={'rate_key': e.phase})
+                if attempt < self.hung_driver_retries:
+                    logger.info("🔄 Restarting browser and retrying the check...")
+        return False
+    
+    def _run_cycle(self, headless, on_new_posts):
+        self.watchdog.start_cycle()
+        started = time.perf_counter()
         try:
-            if self.login():
-                new_posts = self.check_new_posts()
-                print(f"✅ Check completed at {datetime.now()}")
+            self.driver, self.service = self.watchdog.run_owned(
+                'driver_start', self.setup_driver, self.discard_browser, headless=headless
+            )
+            
+            if self.watchdog.run('login', self.login):
+                self.last_compared = 0
+                new_posts = self.check_new_posts(on_new_posts=on_new_posts)
+                # The one INFO line every cycle produces
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    "✅ Check completed in %.1fs: %d posts compared, %d new, %d known",
+                    elapsed, self.last_compared, len(new_posts), self.known_posts.total_count,
+                    extra={'event': 'cycle', 'duration': round(elapsed, 3), 'compared': self.last_compared,
+                           'new': len(new_posts), 'known': self.known_posts.total_count}
+                )
                 return len(new_posts) > 0
             else:
                 return False
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.close_browser()
+            self.watchdog.end_cycle()
+            self.selector_cache.save()
+            flush_logs()
     
     def run_continuous(self):
         """Run continuous monitoring"""
-        print(f"🚀 Starting Superset Post Monitor")
-        print(f"⏰ Checking every {self.check_interval} seconds")
+        logger.info("🚀 Starting Superset Post Monitor")
+        logger.info("⏰ Checking every %d seconds", self.check_interval)
+        logger.info("🤝 Instance %s (lease TTL %gs)", self.coordinator.instance_id, self.coordinator.lease_ttl)
         
+        self.coordinator.start_heartbeat()
+        cycles = 0
         while True:
             try:
+                if not self.coordinator.ensure_leader():
+                    # Stand by until the active poller's lease runs out
+                    flush_logs()
+                    time.sleep(self.coordinator.poll_interval)
+                    continue
+                
                 self.run_once()
-                self.show_statistics()
-                print(f"💤 Sleeping for {self.check_interval} seconds...")
+                cycles += 1
+                if self.stats_every and cycles % self.stats_every == 0:
+                    self.show_statistics()
+                logger.debug("💤 Sleeping for %d seconds...", self.check_interval)
+                flush_logs()
                 time.sleep(self.check_interval)
             except KeyboardInterrupt:
-                print("\n👋 Monitoring stopped by user")
+                logger.info("👋 Monitoring stopped by user")
                 break
             except Exception as e:
-                print(f"❌ Error in monitoring loop: {str(e)}")
+                logger.error("❌ Error in monitoring loop: %s", e)
+                flush_logs()
                 time.sleep(60)  # Wait 1 minute before retrying
+        self.coordinator.stop()
+        flush_logs()
 
 if __name__ == "__main__":
     monitor = SupersetPostMonitor()
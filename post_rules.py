@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Keyword/regex/field rules for tagging, prioritizing, routing and suppressing posts
+
+Rules live in a JSON file (see post_rules.example.json) and are compiled once:
+every keyword from every rule goes into a single Aho-Corasick automaton, and
+every regex into one combined alternation used to find candidate positions.
+Evaluating a post is then one pass over its text for keywords plus one for
+regexes, however many rules there are. Patterns that can't share an
+alternation (inline global flags, backreferences) are searched on their own,
+and invalid patterns are skipped with a warning.
+
+Rule fields:
+    name        label shown in logs
+    keywords    any of these (case-insensitive, whole words) must appear
+    regex       any of these patterns must match (case-insensitive)
+    fields      all of these predicates must hold, e.g. {"cgpa_cutoff": {"lte": 7.0}}
+    search      post fields searched by keywords/regex (default title + details)
+    tags        tags added to matching posts
+    priority    matching posts get at least this priority
+    route       name of a route in "routes" whose log file also receives the post
+    action      "notify" (default) or "suppress"
+
+Available fields: title, author, time, details, cgpa_cutoff (lowest CGPA
+requirement mentioned) and batch_years (years such as 2026 mentioned).
+Predicate operators: eq, ne, in, lt, lte, gt, gte, contains. On list fields a
+predicate holds if any element satisfies it.
+"""
+
+import re
+import json
+from collections import deque
+from monitor_logging import get_logger
+
+logger = get_logger('post_rules')
+
+DEFAULT_SEARCH_FIELDS = ('title', 'details')
+
+CGPA_PATTERNS = [
+    re.compile(r'(\d{1,2}(?:\.\d{1,2})?)\s*(?:or above\s*|and above\s*|\+\s*)?(?:CGPA|CPI|GPA)', re.IGNORECASE),
+    re.compile(r'(?:CGPA|CPI|GPA)\s*(?:of\s*)?(?:[:\-≥>=]\s*)*(\d{1,2}(?:\.\d{1,2})?)', re.IGNORECASE),
+]
+YEAR_PATTERN = re.compile(r'\b(20[2-4]\d)\b')
+# Group references that would point at the wrong group once patterns are joined
+BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+OPERATORS = {
+    'eq': lambda value, arg: value == arg,
+    'ne': lambda value, arg: value != arg,
+    'in': lambda value, arg: value in arg,
+    'lt': lambda value, arg: value is not None and value < arg,
+    'lte': lambda value, arg: value is not None and value <= arg,
+    'gt': lambda value, arg: value is not None and value > arg,
+    'gte': lambda value, arg: value is not None and value >= arg,
+    'contains': lambda value, arg: isinstance(value, str) and arg.lower() in value.lower(),
+}
+
+
+def extract_fields(post):
+    """Structured fields derived from a post's text"""
+    text = f"{post.get('title', '')}\n{post.get('details', '')}"
+    cutoffs = [float(m.group(1)) for pattern in CGPA_PATTERNS for m in pattern.finditer(text)]
+    cutoffs = [value for value in cutoffs if 0 < value <= 10]
+    return {
+        'title': post.get('title', ''),
+        'author': post.get('author', ''),
+        'time': post.get('time', ''),
+        'details': post.get('details', ''),
+        'cgpa_cutoff': min(cutoffs) if cutoffs else None,
+        'batch_years': sorted({int(year) for year in YEAR_PATTERN.findall(text)}),
+    }
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over lower-cased keywords"""
+
+    def __init__(self, keywords):
+        # keywords: iterable of (keyword, rule_index)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # node -> [(keyword_length, rule_index)]
+
+        for keyword, rule_index in keywords:
+            node = 0
+            for char in keyword.lower():
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append((len(keyword), rule_index))
+
+        # Breadth-first pass to fill in failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0) if node else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def matching_rules(self, text):
+        """Rule indices with at least one whole-word keyword hit in text"""
+        lowered = text.lower()
+        matched = set()
+        node = 0
+        for end, char in enumerate(lowered):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for length, rule_index in self.output[node]:
+                if rule_index in matched:
+                    continue
+                start = end - length + 1
+                # Whole words only, so "IT" doesn't fire inside "submIT"
+                if start > 0 and lowered[start - 1].isalnum() and lowered[start].isalnum():
+                    continue
+                if end + 1 < len(lowered) and lowered[end + 1].isalnum() and lowered[end].isalnum():
+                    continue
+                matched.add(rule_index)
+        return matched
+
+
+class RuleResult:
+    """Outcome of evaluating every rule against one post"""
+
+    def __init__(self):
+        self.matched = []
+        self.tags = []
+        self.priority = 0
+        self.routes = []
+        self.suppressed = False
+
+
+class RuleEngine:
+    """All rules compiled into one keyword automaton and one combined regex"""
+
+    def __init__(self, rules=None, routes=None):
+        self.rules = rules or []
+        self.routes = routes or {}
+
+        keywords = []
+        self._regexes = {}   # rule index -> [compiled pattern]
+        self._joined = {}    # rule index -> [compiled pattern] also in the combined regex
+        self._separate = {}  # rule index -> [compiled pattern] kept out of the combined regex
+        alternatives = []
+        for index, rule in enumerate(self.rules):
+            keywords.extend((keyword, index) for keyword in rule.get('keywords', []) if keyword)
+            compiled = []
+            for pattern in rule.get('regex', []):
+                try:
+                    regex = re.compile(pattern, re.IGNORECASE)
+                except re.error as e:
+                    logger.warning("⚠️ Skipping invalid regex in rule %s: %r (%s)",
+                                   rule.get('name', index + 1), pattern, e)
+                    continue
+                compiled.append(regex)
+                if self._combinable(pattern):
+                    alternatives.append(f"(?:{pattern})")
+                    self._joined.setdefault(index, []).append(regex)
+                else:
+                    self._separate.setdefault(index, []).append(regex)
+            if rule.get('regex'):
+                # A rule whose patterns were all invalid can never match
+                self._regexes[index] = compiled
+
+        self._keywords = KeywordMatcher(keywords)
+        # Only used to find candidate positions; each rule's own pattern confirms the hit
+        self._combined = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+
+    @staticmethod
+    def _combinable(pattern):
+        """Whether a pattern behaves the same inside a (?:...) alternation with others"""
+        if BACKREFERENCE.search(pattern):
+            return False
+        try:
+            re.compile(f"(?:{pattern})|(?:)", re.IGNORECASE)
+        except re.error:
+            # e.g. inline global flags, which must start the whole expression
+            return False
+        return True
+
+    @classmethod
+    def from_file(cls, path):
+        """Load and compile a rules file; a missing or unreadable file means no rules"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                doc = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            logger.warning("⚠️ Could not load rules from %s, running without rules: %s", path, e)
+            return cls()
+        if not isinstance(doc, dict):
+            logger.warning("⚠️ Rules file %s should hold a JSON object, running without rules", path)
+            return cls()
+        engine = cls(doc.get('rules', []), doc.get('routes', {}))
+        logger.info("📐 Compiled %d post rules from %s", len(engine.rules), path)
+        return engine
+
+    def __len__(self):
+        return len(self.rules)
+
+    def _search_text(self, post, fields):
+        return '\n'.join(str(post.get(field) or '') for field in fields)
+
+    def _regex_rules(self, text, candidates):
+        """Which of the candidate regex rules match somewhere in text"""
+        matched = set()
+        # Patterns that couldn't be combined are searched directly
+        for index in candidates:
+            if any(regex.search(text) for regex in self._separate.get(index, [])):
+                matched.add(index)
+        remaining = {index: self._joined[index] for index in candidates
+                     if index not in matched and index in self._joined}
+        pos = 0
+        while remaining and self._combined is not None:
+            m = self._combined.search(text, pos)
+            if m is None:
+                break
+            # Something matches at this position - find out which rules it was
+            for index in list(remaining):
+                if any(pattern.match(text, m.start()) for pattern in remaining[index]):
+                    matched.add(index)
+                    del remaining[index]
+            pos = m.start() + 1
+        return matched
+
+    @staticmethod
+    def _fields_hold(predicates, fields):
+        for field, ops in predicates.items():
+            value = fields.get(field)
+            for op, arg in ops.items():
+                check = OPERATORS.get(op)
+                if check is None:
+                    return False
+                if isinstance(value, list):
+                    if not any(check(item, arg) for item in value):
+                        return False
+                elif not check(value, arg):
+                    return False
+        return True
+
+    def evaluate(self, post):
+        result = RuleResult()
+        if not self.rules:
+            return result
+
+        # One automaton pass and one regex pass per distinct set of searched fields
+        keyword_hits = {}
+        regex_hits = {}
+        searches = {}
+        for index, rule in enumerate(self.rules):
+            searches.setdefault(tuple(rule.get('search', DEFAULT_SEARCH_FIELDS)), []).append(index)
+        for fields, indices in searches.items():
+            text = self._search_text(post, fields)
+            hits = self._keywords.matching_rules(text)
+            regex_candidates = [i for i in indices if i in self._regexes]
+            regex_matched = self._regex_rules(text, regex_candidates) if regex_candidates else set()
+            for index in indices:
+                keyword_hits[index] = index in hits
+                regex_hits[index] = index in regex_matched
+
+        derived = None
+        for index, rule in enumerate(self.rules):
+            if rule.get('keywords') and not keyword_hits[index]:
+                continue
+            if rule.get('regex') and not regex_hits[index]:
+                continue
+            if rule.get('fields'):
+                if derived is None:
+                    derived = extract_fields(post)
+                if not self._fields_hold(rule['fields'], derived):
+                    continue
+
+            result.matched.append(rule.get('name', f"rule {index + 1}"))
+            for tag in rule.get('tags', []):
+                if tag not in result.tags:
+                    result.tags.append(tag)
+            result.priority = max(result.priority, rule.get('priority', 0))
+            if rule.get('route') and rule['route'] not in result.routes:
+                result.routes.append(rule['route'])
+            if rule.get('action') == 'suppress':
+                result.suppressed = True
+        return result
+
+    def apply(self, post):
+        """Evaluate and record the outcome on the post dict itself"""
+        result = self.evaluate(post)
+        if result.matched:
+            post['tags'] = result.tags
+            post['priority'] = result.priority
+            post['routes'] = result.routes
+            post['matched_rules'] = result.matched
+            if result.suppressed:
+                post['suppressed'] = True
+        return result
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Compact storage for known posts
+
+Repeated strings (authors, times, main links, link URLs and texts) are interned
+in memory and written once to a lookup table on disk. Large details bodies are
+kept zlib-compressed against a shared dictionary and only decompressed when
+they are actually read. On disk the whole document is gzip-compressed, which
+catches the redundancy between posts that per-body compression can't.
+
+Only a recent window of posts is kept in memory. Older posts are appended to an
+archive file and remembered by a sorted array of 64-bit title hashes, which is
+all check_new_posts needs to know they have been seen.
+"""
+
+import os
+import sys
+import json
+import gzip
+import zlib
+import base64
+import hashlib
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from collections import Counter
+from collections.abc import Mapping, MutableMapping
+
+STORE_FORMAT = 3                # 2 = plain JSON with base64 bodies, 3 = gzipped JSON
+GZIP_MAGIC = b'\x1f\x8b'
+COMPRESS_THRESHOLD = 160        # Bodies shorter than this are kept as plain text
+MAX_DICTIONARY_SIZE = 32 * 1024  # zlib only looks back 32 KB
+MIN_DICTIONARY_POSTS = 8        # Don't train a dictionary on a handful of posts
+
+POST_FIELDS = ('title', 'author', 'time', 'details', 'links', 'main_link', 'first_seen')
+
+
+def title_hash(title):
+    """Stable 64-bit hash of a post title"""
+    return int.from_bytes(hashlib.blake2b(title.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _intern(value):
+    """Intern a string so repeated values share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class StoredPost(Mapping):
+    """A known post that behaves like the old dict but decompresses details lazily"""
+
+    __slots__ = ('_store', 'title', 'author', 'time', 'main_link', 'links',
+                 'first_seen', 'extra', '_details', '_details_length')
+
+    def __init__(self, store, data):
+        self._store = store
+        self.title = data.get('title', '')
+        self.author = _intern(data.get('author', ''))
+        self.time = _intern(data.get('time', ''))
+        self.main_link = _intern(data.get('main_link', ''))
+        self.first_seen = data.get('first_seen', '')
+        self.set_links(data.get('links', []))
+        self.extra = {k: v for k, v in data.items() if k not in POST_FIELDS} or None
+        self.set_details(data.get('details', ''))
+
+    @property
+    def details(self):
+        """Full details text, decompressed on access"""
+        if isinstance(self._details, bytes):
+            return self._store.decompress(self._details)
+        return self._details
+
+    @property
+    def details_length(self):
+        """Length of the details text without decompressing it"""
+        return self._details_length
+
+    def set_links(self, links):
+        """Store links as (url, text, resolved target or '') tuples"""
+        self.links = tuple(
+            (_intern(link.get('url', '')), _intern(link.get('text', '')), _intern(link.get('resolved', '')))
+            for link in links
+        )
+
+    def set_details(self, text):
+        text = text or ''
+        self._details_length = len(text)
+        self._details = self._store.compress(text) if len(text) >= COMPRESS_THRESHOLD else text
+
+    def _keys(self):
+        keys = [field for field in POST_FIELDS if field != 'links' or self.links]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def __getitem__(self, key):
+        if key == 'details':
+            return self.details
+        if key == 'links':
+            return [
+                {'url': url, 'text': text, 'resolved': resolved} if resolved else {'url': url, 'text': text}
+                for url, text, resolved in self.links
+            ]
+        if key in POST_FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def to_dict(self):
+        """Plain dict copy with the details decompressed"""
+        return {key: self[key] for key in self}
+
+
+class PostStore(MutableMapping):
+    """Title -> post mapping persisted to known_posts.json in a compact format
+
+    Iteration and item access cover the in-memory window only; ``in`` also
+    answers for archived posts.
+    """
+
+    def __init__(self, path='known_posts.json', archive_path=None, retention_days=0, max_posts=0):
+        self.path = path
+        self.archive_path = archive_path or f"{os.path.splitext(path)[0]}_archive.jsonl"
+        self.retention_days = retention_days  # 0 disables age-based eviction
+        self.max_posts = max_posts            # 0 keeps every post in memory
+        self.dictionary = b''
+        self._trained_on = 0
+        self._inserted = 0
+        self._posts = {}
+        self._archived = array('Q')  # Sorted title hashes of evicted posts
+        # Guards the maps so a save on another thread can run during a scrape
+        self.lock = threading.RLock()
+
+    # Mapping interface -------------------------------------------------
+
+    def __getitem__(self, title):
+        return self._posts[title]
+
+    def __setitem__(self, title, data):
+        with self.lock:
+            # Compress under the lock so a concurrent retrain can't swap the dictionary midway
+            self._posts[title] = data if isinstance(data, StoredPost) else StoredPost(self, data)
+            self._inserted += 1
+
+    def __delitem__(self, title):
+        with self.lock:
+            del self._posts[title]
+
+    def __iter__(self):
+        return iter(self._posts)
+
+    def __len__(self):
+        return len(self._posts)
+
+    def __contains__(self, title):
+        return title in self._posts or self.is_archived(title)
+
+    def is_archived(self, title):
+        """Check the archived hash set for a title"""
+        value = title_hash(title)
+        i = bisect_left(self._archived, value)
+        return i < len(self._archived) and self._archived[i] == value
+
+    def upsert_many(self, posts):
+        """Insert or refresh many posts under one lock hold; returns (inserted, updated)
+
+        Existing posts are only updated when the new details are longer, and
+        archived posts are left alone.
+        """
+        inserted = updated = 0
+        with self.lock:
+            for title, data in posts.items():
+                if self.is_archived(title):
+                    continue
+                current = self._posts.get(title)
+                if current is None:
+                    self._posts[title] = StoredPost(self, data)
+                    self._inserted += 1
+                    inserted += 1
+                elif len(data.get('details') or '') > current.details_length:
+                    current.set_details(data['details'])
+                    current.set_links(data.get('links', []))
+                    updated += 1
+        return inserted, updated
+
+    @property
+    def archived_count(self):
+        return len(self._archived)
+
+    @property
+    def total_count(self):
+        """Posts in memory plus posts evicted to the archive"""
+        return len(self._posts) + len(self._archived)
+
+    # Compression -------------------------------------------------------
+
+    def compress(self, text):
+        if self.dictionary:
+            compressor = zlib.compressobj(9, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(9)
+        return compressor.compress(text.encode('utf-8')) + compressor.flush()
+
+    def decompress(self, data):
+        if self.dictionary:
+            decompressor = zlib.decompressobj(zdict=self.dictionary)
+        else:
+            decompressor = zlib.decompressobj()
+        return (decompressor.decompress(data) + decompressor.flush()).decode('utf-8')
+
+    def train_dictionary(self):
+        """Build a shared dictionary from lines that repeat across post bodies"""
+        bodies = [post.details for post in self._posts.values()]
+        line_counts = Counter(
+            line for body in bodies for line in set(body.split('\n')) if len(line) > 3
+        )
+        # zlib favours matches near the end of the dictionary, so the most
+        # common lines go last
+        common = sorted(
+            (line for line, count in line_counts.items() if count > 1),
+            key=lambda line: (line_counts[line], len(line))
+        )
+        dictionary = '\n'.join(common).encode('utf-8')[-MAX_DICTIONARY_SIZE:]
+
+        self.dictionary = dictionary
+        self._trained_on = len(self._posts)
+        for post, body in zip(self._posts.values(), bodies):
+            post.set_details(body)
+
+    def _maybe_retrain(self):
+        """Retrain once as many posts have been added as the dictionary was built from"""
+        if (len(self._posts) >= MIN_DICTIONARY_POSTS
+                and self._inserted >= max(MIN_DICTIONARY_POSTS, self._trained_on)):
+            self.train_dictionary()
+            self._inserted = 0
+
+    # Retention ---------------------------------------------------------
+
+    def enforce_retention(self, now=None):
+        """Move posts outside the retention window to the archive file"""
+        if not self.retention_days and not self.max_posts:
+            return 0
+
+        # Newest first, by when we first saw them
+        ordered = sorted(self._posts.items(), key=lambda item: item[1].first_seen, reverse=True)
+        keep = ordered[:self.max_posts] if self.max_posts else ordered
+        evict = ordered[len(keep):]
+
+        if self.retention_days:
+            cutoff = ((now or datetime.now()) - timedelta(days=self.retention_days)).isoformat()
+            evict.extend(item for item in keep if item[1].first_seen and item[1].first_seen < cutoff)
+
+        if not evict:
+            return 0
+
+        with open(self.archive_path, 'a', encoding='utf-8') as f:
+            for key, post in evict:
+                record = post.to_dict()
+                details = record.pop('details', '')
+                record['key'] = key
+                if details:
+                    record['details_z'] = base64.b64encode(zlib.compress(details.encode('utf-8'), 9)).decode('ascii')
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        hashes = list(self._archived)
+        for key, _ in evict:
+            del self._posts[key]
+            hashes.append(title_hash(key))
+        self._archived = array('Q', sorted(set(hashes)))
+        return len(evict)
+
+    def iter_archived(self):
+        """Yield archived posts as plain dicts, read back from disk"""
+        try:
+            with open(self.archive_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if 'details_z' in record:
+                        record['details'] = zlib.decompress(base64.b64decode(record.pop('details_z'))).decode('utf-8')
+                    yield record
+        except FileNotFoundError:
+            return
+
+    # Persistence -------------------------------------------------------
+
+    def load(self):
+        """Load posts from disk, converting the old plain-JSON format if needed"""
+        self._posts = {}
+        self._archived = array('Q')
+        self.dictionary = b''
+        self._trained_on = 0
+        self._inserted = 0
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        if data.startswith(GZIP_MAGIC):
+            data = gzip.decompress(data)
+        doc = json.loads(data.decode('utf-8'))
+
+        if not isinstance(doc, dict):
+            # Handle old format (set/list) by starting fresh
+            return self
+
+        if doc.get('format') not in (2, STORE_FORMAT):
+            # Old format: {title: {...full post data...}}
+            for title, data in doc.items():
+                if isinstance(data, dict):
+                    self[title] = data
+            self._maybe_retrain()
+            return self
+
+        self.dictionary = base64.b64decode(doc.get('dictionary', ''))
+        self._trained_on = doc.get('trained_on', 0)
+        self._archived = array('Q')
+        self._archived.frombytes(base64.b64decode(doc.get('archived', '')))
+        if sys.byteorder == 'big':
+            self._archived.byteswap()
+        strings = doc.get('strings', [])
+        for record in doc.get('posts', []):
+            post = StoredPost.__new__(StoredPost)
+            post._store = self
+            post.title = record['title']
+            post.author = _intern(strings[record['author']])
+            post.time = _intern(strings[record['time']])
+            post.main_link = _intern(strings[record['main_link']])
+            post.first_seen = record.get('first_seen', '')
+            post.links = tuple(
+                (_intern(strings[link[0]]), _intern(strings[link[1]]),
+                 _intern(strings[link[2]]) if len(link) > 2 else '')
+                for link in record.get('links', [])
+            )
+            post.extra = record.get('extra')
+            if 'details_z' in record:
+                post._details = base64.b64decode(record['details_z'])
+                post._details_length = record.get('details_length', 0)
+            else:
+                post.set_details(record.get('details', ''))
+            self._posts[record.get('key', post.title)] = post
+        self._inserted = 0
+        return self
+
+    def to_json(self):
+        """Serialize the store with a shared string table; bodies are written as
+        plain text so the document-level compression in save() sees all of them"""
+        self._maybe_retrain()
+
+        strings = []
+        index = {}
+
+        def ref(value):
+            if value not in index:
+                index[value] = len(strings)
+                strings.append(value)
+            return index[value]
+
+        records = []
+        for key, post in self._posts.items():
+            record = {
+                'title': post.title,
+                'author': ref(post.author),
+                'time': ref(post.time),
+                'main_link': ref(post.main_link),
+                'first_seen': post.first_seen,
+            }
+            if key != post.title:
+                record['key'] = key
+            if post.links:
+                record['links'] = [
+                    [ref(url), ref(text), ref(resolved)] if resolved else [ref(url), ref(text)]
+                    for url, text, resolved in post.links
+                ]
+            if post._details:
+                record['details'] = post.details
+            if post.extra:
+                record['extra'] = post.extra
+            records.append(record)
+
+        archived = array('Q', self._archived)
+        if sys.byteorder == 'big':
+            archived.byteswap()
+
+        doc = {
+            'format': STORE_FORMAT,
+            'dictionary': base64.b64encode(self.dictionary).decode('ascii'),
+            'trained_on': self._trained_on,
+            'strings': strings,
+            'posts': records,
+            'archived': base64.b64encode(archived.tobytes()).decode('ascii'),
+        }
+        return json.dumps(doc, ensure_ascii=False, separators=(',', ':'))
+
+    def save(self):
+        """Write the store atomically so a crash never leaves a half-written file"""
+        with self.lock:
+            self.enforce_retention()
+            payload = self.to_json()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(payload.encode('utf-8'), 9, mtime=0))
+        os.replace(tmp_path, self.path)
@@ -6,6 +6,14 @@ Simple runner for Superset Post Monitor
 import sys
 from post_monitor import SupersetPostMonitor
 
+def get_option_value(flag):
+    """Return the argument following a flag, or None"""
+    if flag in sys.argv:
+        index = sys.argv.index(flag)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return None
+
 def main():
     print("🚀 Superset Post Monitor")
     print("=" * 40)
@@ -15,6 +23,9 @@ def main():
     # Check for different modes
     debug_mode = "--debug" in sys.argv
     stats_mode = "--stats" in sys.argv
+    replay_dir = get_option_value("--replay")
+    profile_cycles = get_option_value("--profile")
+    reextract_dir = get_option_value("--reextract")
     headless = not debug_mode
     
     if debug_mode:
@@ -22,7 +33,28 @@ def main():
     
     if stats_mode:
         print("📊 Showing post statistics...")
-        monitor.show_statistics()
+        print(monitor.format_statistics())
+        return
+    
+    if replay_dir:
+        print(f"🔁 Replaying archived snapshots from {replay_dir}...")
+        monitor.replay_snapshots(replay_dir)
+        return
+    
+    if reextract_dir:
+        workers = get_option_value("--workers")
+        print(f"🔁 Re-extracting posts from saved pages in {reextract_dir}...")
+        monitor.reextract_pages(reextract_dir, int(workers) if workers else None)
+        return
+    
+    if profile_cycles:
+        # Only imported here so normal runs pay nothing for profiling
+        from cycle_profiler import CycleProfiler
+        profiler = CycleProfiler(get_option_value("--profile-dir") or "profiles")
+        print(f"🔬 Profiling {profile_cycles} cycle(s)...")
+        for _ in range(int(profile_cycles)):
+            profiler.profile(monitor.run_once, headless=headless)
+        profiler.write_summary()
         return
     
     if "--once" in sys.argv:
@@ -34,7 +66,7 @@ def main():
             print("ℹ️ No new posts found.")
         
         # Show statistics after the check
-        monitor.show_statistics()
+        print(monitor.format_statistics())
     else:
         print("🔄 Starting continuous monitoring...")
         print("⏰ Checking every 5 minutes")
@@ -44,10 +76,14 @@ def main():
         print("-" * 40)
         
         # Show initial statistics
-        monitor.show_statistics()
+        print(monitor.format_statistics())
         
         # Start continuous monitoring
-        monitor.run_continuous()
+        if "--async" in sys.argv:
+            from async_runtime import run_async
+            run_async(monitor, headless=headless)
+        else:
+            monitor.run_continuous()
 
 def show_help():
     print("🚀 Superset Post Monitor - Usage:")
@@ -55,7 +91,13 @@ def show_help():
     print("python run_monitor.py                 # Start continuous monitoring")
     print("python run_monitor.py --once          # Run single check")
     print("python run_monitor.py --once --debug  # Run single check with visible browser")
+    print("python run_monitor.py --async         # Continuous monitoring with overlapped notify/save")
     print("python run_monitor.py --stats         # Show post statistics only")
+    print("python run_monitor.py --replay DIR    # Replay archived snapshots without a browser")
+    print("python run_monitor.py --reextract DIR # Rebuild known posts from saved HTML pages in DIR")
+    print("python run_monitor.py --reextract DIR --workers N  # Same, with N worker processes")
+    print("python run_monitor.py --profile N     # Profile N cycles (CPU + allocations) into profiles/")
+    print("python run_monitor.py --profile N --profile-dir DIR  # Same, writing profiles to DIR")
     print("python run_monitor.py --help          # Show this help")
     print("\nFeatures:")
     print("• Scrolls to load ALL posts from the page")
@@ -63,6 +105,7 @@ def show_help():
     print("• Sends desktop notifications for new posts")
     print("• Logs all new posts to new_posts.log")
     print("• Stores known posts in known_posts.json")
+    print("• Archives every page snapshot when SNAPSHOT_ARCHIVE_DIR is set")
 
 if __name__ == "__main__":
     if "--help" in sys.argv or "-h" in sys.argv:
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Remembers which selector worked for each site and role
+
+Login, scroll container and prose lookups each try a list of selectors in
+order, most specific first. The cache puts the selector that worked last time
+at the front, so a full re-probe only happens after the cached one stops
+matching.
+
+Generic fallbacks tend to match something on any page, so once cached they
+would never stop matching. A selector less specific than the cached one (or
+than the top of the list) is therefore only cached after it has won several
+lookups in a row, and every so often the list is tried in its own order so a
+more specific selector that matches again takes the front back.
+"""
+
+import os
+import json
+from urllib.parse import urlparse
+from monitor_logging import get_logger
+
+logger = get_logger('selector_cache')
+
+PROMOTE_AFTER = 3    # Consecutive wins before a less specific selector is cached
+REPROBE_EVERY = 50   # Lookups between tries of the list in its own order
+
+
+def site_of(url):
+    """Cache key for a URL - just the host"""
+    return urlparse(url or '').netloc or 'unknown'
+
+
+class SelectorCache:
+    """Persistent (site, role) -> selector map with hit/miss counters"""
+
+    def __init__(self, path='selector_cache.json'):
+        self.path = path
+        self.entries = {}  # "site|role" -> {'selector': [by, value], 'hits': n, 'misses': n, ...}
+        self._order = {}   # "site|role" -> the caller's selector list, most specific first
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def _key(site, role):
+        return f"{site}|{role}"
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+        except (json.JSONDecodeError, ValueError):
+            logger.warning("⚠️ Error reading %s, starting with an empty selector cache", self.path)
+            self.entries = {}
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except Exception as e:
+            logger.warning("⚠️ Error saving selector cache: %s", e)
+
+    def cached(self, site, role):
+        entry = self.entries.get(self._key(site, role))
+        return tuple(entry['selector']) if entry and entry.get('selector') else None
+
+    def _entry(self, site, role):
+        return self.entries.setdefault(self._key(site, role), {'selector': None, 'hits': 0, 'misses': 0})
+
+    def ordered(self, site, role, selectors):
+        """Return the selectors with the cached one (if any) moved to the front"""
+        selectors = [tuple(selector) for selector in selectors]
+        self._order[self._key(site, role)] = list(selectors)
+        cached = self.cached(site, role)
+        if cached in selectors:
+            entry = self._entry(site, role)
+            entry['lookups'] = entry.get('lookups', 0) + 1
+            if entry['lookups'] % REPROBE_EVERY == 0:
+                # Give the more specific selectors a chance to win the front back
+                return selectors
+            selectors.remove(cached)
+            selectors.insert(0, cached)
+        return selectors
+
+    def _rank(self, key, selector):
+        order = self._order.get(key, [])
+        return order.index(selector) if selector in order else len(order)
+
+    def record(self, site, role, selector):
+        """Record the selector that matched - a hit if it was the cached one"""
+        selector = tuple(selector)
+        key = self._key(site, role)
+        entry = self._entry(site, role)
+        cached = tuple(entry['selector']) if entry['selector'] else None
+        self.dirty = True
+        if cached == selector:
+            entry['hits'] += 1
+            entry.pop('candidate', None)
+            entry.pop('streak', None)
+            return
+
+        entry['misses'] += 1
+        rank = self._rank(key, selector)
+        if rank == 0 or (cached is not None and rank < self._rank(key, cached)):
+            # More specific than what we had - take it straight away
+            promote = True
+        else:
+            # Less specific: maybe the right element just wasn't there this time
+            if entry.get('candidate') and tuple(entry['candidate']) == selector:
+                entry['streak'] = entry.get('streak', 0) + 1
+            else:
+                entry['candidate'], entry['streak'] = list(selector), 1
+            promote = entry['streak'] >= PROMOTE_AFTER
+        if promote:
+            entry['selector'] = list(selector)
+            entry.pop('candidate', None)
+            entry.pop('streak', None)
+
+    def record_failure(self, site, role):
+        """No selector matched at all - forget the cached one"""
+        entry = self.entries.setdefault(self._key(site, role), {'selector': None, 'hits': 0, 'misses': 0})
+        entry['misses'] += 1
+        entry['selector'] = None
+        self.dirty = True
+
+    def stats(self):
+        """Total hits and misses plus the per-role breakdown"""
+        entries = list(self.entries.values())  # The scrape thread may add entries meanwhile
+        hits = sum(entry['hits'] for entry in entries)
+        misses = sum(entry['misses'] for entry in entries)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'entries': self.entries,
+        }
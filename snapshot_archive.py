@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Content-addressed archive of scrape snapshots
+
+Each cycle's page source (or captured feed JSON) is stored gzip-compressed under
+its SHA-256, so identical pages across cycles are kept only once. index.jsonl
+records every capture in order and is what replay walks through.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+from datetime import datetime
+from monitor_logging import get_logger
+
+logger = get_logger('snapshot_archive')
+
+
+class SnapshotArchive:
+    """objects/<2 hex>/<sha256>.<kind>.gz plus an append-only index.jsonl"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, 'objects')
+        self.index_path = os.path.join(directory, 'index.jsonl')
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def _object_path(self, digest, kind):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.{kind}.gz")
+
+    def store(self, content, kind='html', url=None):
+        """Archive one snapshot and return (digest, was_new)"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest, kind)
+
+        is_new = not os.path.exists(path)
+        if is_new:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        entry = {
+            'captured_at': datetime.now().isoformat(),
+            'digest': digest,
+            'kind': kind,
+            'url': url,
+            'size': len(data),
+        }
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        return digest, is_new
+
+    def load(self, digest, kind='html'):
+        with gzip.open(self._object_path(digest, kind), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def entries(self):
+        """Index entries in capture order"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def iter_snapshots(self, kind=None):
+        """Yield (entry, content) for every archived capture, optionally of one kind"""
+        for entry in self.entries():
+            if kind and entry['kind'] != kind:
+                continue
+            try:
+                yield entry, self.load(entry['digest'], entry['kind'])
+            except FileNotFoundError:
+                logger.warning("⚠️ Snapshot object missing for %s, skipping", entry['digest'][:12])
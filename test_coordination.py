@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script to verify coordination between monitor instances over the shared
+SQLite backend: lease takeover, claims, and claiming before any work is done
+on a new post
+"""
+
+import os
+import sys
+import time
+import tempfile
+from types import SimpleNamespace
+from coordination import Coordinator, SQLiteCoordinationBackend, LEASE_NAME
+from phase_deadlines import PhaseWatchdog
+from post_rules import RuleEngine
+from post_store import PostStore
+from post_monitor import SupersetPostMonitor
+
+
+def shared_db():
+    return os.path.join(tempfile.mkdtemp(), 'coordination.db')
+
+
+def test_lease_takeover():
+    """A standby only takes the lease once the leader's has expired"""
+    path = shared_db()
+    leader = Coordinator(SQLiteCoordinationBackend(path), 'a', lease_ttl=60)
+    standby = Coordinator(SQLiteCoordinationBackend(path), 'b', lease_ttl=60)
+
+    assert leader.ensure_leader() and not standby.ensure_leader()
+    assert standby.current_leader() == 'a'
+    # Renewing keeps it
+    assert leader.ensure_leader()
+
+    # Once the lease runs out the standby takes over
+    later = time.time() + 61
+    assert standby.backend.try_acquire(LEASE_NAME, 'b', 60, later)
+    assert standby.backend.holder(LEASE_NAME, later) == 'b'
+    assert not leader.backend.try_acquire(LEASE_NAME, 'a', 60, later)
+
+    # Handing the lease back lets a standby in straight away
+    standby.is_leader = True
+    standby.stop()
+    assert leader.ensure_leader()
+    print("✅ Lease taken over only after expiry or release")
+
+
+def test_claims_are_exclusive_and_kept():
+    """Each post is claimed by exactly one instance, however long ago it was claimed"""
+    path = shared_db()
+    first = Coordinator(SQLiteCoordinationBackend(path), 'a')
+    second = Coordinator(SQLiteCoordinationBackend(path), 'b')
+    posts = [{'title': f'Post {i}'} for i in range(4)]
+
+    assert first.claim_posts(posts[:2]) == posts[:2]
+    assert second.claim_posts(posts) == posts[2:]
+    assert first.claim_posts(posts) == []
+
+    # A new leader long after still sees every claim
+    first.ensure_leader()
+    later = Coordinator(SQLiteCoordinationBackend(path), 'c')
+    assert later.claim_posts(posts) == []
+    print("✅ Claims exclusive and kept")
+
+
+def standby_monitor(coordinator, path):
+    """Just enough of a monitor for _diff_batches"""
+    monitor = SimpleNamespace(
+        known_posts=PostStore(path),
+        rules=RuleEngine(),
+        coordinator=coordinator,
+        watchdog=PhaseWatchdog({}),
+        link_resolver=None,
+        enriched=[],
+        notified=[],
+    )
+    monitor.detail_fetcher = object()
+    monitor.fetch_full_details = monitor.enriched.extend
+    monitor.notify_new_posts = monitor.notified.extend
+    return monitor
+
+
+def test_claimed_elsewhere_not_enriched():
+    """Posts another instance already handled are stored but not fetched or notified"""
+    db = shared_db()
+    Coordinator(SQLiteCoordinationBackend(db), 'old-leader').claim_posts([{'title': 'Old post'}])
+
+    monitor = standby_monitor(Coordinator(SQLiteCoordinationBackend(db), 'new-leader'),
+                              os.path.join(tempfile.mkdtemp(), 'known_posts.json'))
+    monitor.watchdog.start_cycle()
+    feed = [{'title': 'Old post', 'details': 'preview'}, {'title': 'New post', 'details': 'preview'}]
+    new_posts = []
+    SupersetPostMonitor._diff_batches(monitor, [feed], new_posts, False, None)
+
+    assert [post['title'] for post in monitor.enriched] == ['New post']
+    assert [post['title'] for post in monitor.notified] == ['New post']
+    # Both are remembered so neither is looked at again
+    assert 'Old post' in monitor.known_posts and 'New post' in monitor.known_posts
+    assert len(new_posts) == 2
+    print("✅ Posts claimed elsewhere skipped before enrichment")
+
+
+def main():
+    print("🧪 Testing coordination")
+    print("=" * 40)
+    tests = [test_lease_takeover, test_claims_are_exclusive_and_kept, test_claimed_elsewhere_not_enriched]
+    passed = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+            passed = False
+    print("\n✅ Coordination test passed!" if passed else "\n❌ Coordination test failed")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that the offline extractor (html_extractor, used for
+replay and --reextract) and the live Selenium extraction in post_monitor agree
+
+The live code is run against the fake Superset's markup through a small
+stand-in for Selenium's WebElement built on BeautifulSoup, so no browser is
+needed.
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+from fake_superset import FakeSuperset
+from html_extractor import FEED_HEADER_CLASS, PROSE_SELECTORS, element_text, extract_posts_from_html
+from post_monitor import SupersetPostMonitor
+from selector_cache import SelectorCache
+
+PAGE_URL = 'http://127.0.0.1/students'
+COMPARED_FIELDS = ('title', 'author', 'time', 'details', 'links', 'main_link', 'detail_url')
+
+
+class SoupElement:
+    """Just enough of Selenium's WebElement for parse_feed_header"""
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    @property
+    def text(self):
+        return element_text(self.tag)
+
+    def get_attribute(self, name):
+        value = self.tag.get(name)
+        # Selenium hands back resolved URLs for href
+        return urljoin(PAGE_URL, value) if name == 'href' and value else value
+
+    def find_elements(self, by, value):
+        if by == By.CSS_SELECTOR:
+            return [SoupElement(tag) for tag in self.tag.select(value)]
+        if by == By.TAG_NAME:
+            return [SoupElement(tag) for tag in self.tag.find_all(value)]
+        if by == By.XPATH and set(value.split('/')) == {'..'}:
+            tag = self.tag
+            for _ in value.split('/'):
+                tag = tag.parent
+            return [SoupElement(tag)] if tag is not None else []
+        raise NotImplementedError(f"{by}={value}")
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return found[0]
+
+
+def live_posts(html):
+    """Run the monitor's own parse_feed_header over a page without a browser"""
+    monitor = SimpleNamespace(
+        dashboard_url=PAGE_URL,
+        driver=SimpleNamespace(current_url=PAGE_URL),
+        selector_cache=SelectorCache(os.path.join(tempfile.mkdtemp(), 'selector_cache.json')),
+    )
+    soup = BeautifulSoup(html, 'html.parser')
+    prose_selectors = [(By.CSS_SELECTOR, selector) for selector in PROSE_SELECTORS]
+    return [
+        SupersetPostMonitor.parse_feed_header(monitor, SoupElement(header), index, prose_selectors)
+        for index, header in enumerate(soup.find_all(class_=FEED_HEADER_CLASS))
+    ]
+
+
+def fake_feed_html(posts=60):
+    site = FakeSuperset(posts=posts, page_size=posts)
+    # Give one card its own link, as a post page would
+    return f'<html><body>{site.feed_page(0)["html"]}</body></html>'.replace(
+        '<div class="flex items-start">', '<div class="flex items-start"><a href="/students/posts/0"></a>', 1
+    )
+
+
+def test_extractors_agree():
+    """Both extractors read the same posts from the fake Superset feed"""
+    html = fake_feed_html()
+    offline = extract_posts_from_html(html, PAGE_URL)
+    live = live_posts(html)
+
+    assert len(offline) == len(live) == 60, (len(offline), len(live))
+    for offline_post, live_post in zip(offline, live):
+        for field in COMPARED_FIELDS:
+            assert offline_post[field] == live_post[field], \
+                f"{field} differs for {live_post['title']!r}: {offline_post[field]!r} vs {live_post[field]!r}"
+    assert any(post['links'] for post in live), "the fake feed should include linked posts"
+    assert live[0]['detail_url'] == urljoin(PAGE_URL, '/students/posts/0')
+    print("✅ Offline and live extraction agree")
+
+
+def main():
+    print("🧪 Testing extractor agreement")
+    print("=" * 40)
+    passed = True
+    try:
+        test_extractors_agree()
+    except AssertionError as e:
+        print(f"❌ {test_extractors_agree.__doc__}: {e}")
+        passed = False
+    print("\n✅ Extractor test passed!" if passed else "\n❌ Extractor test failed")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script to verify short-link resolution against a local redirecting server
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from link_resolver import LinkResolver
+
+REQUEST_COUNT = {'HEAD': 0, 'GET': 0}
+
+
+class RedirectHandler(BaseHTTPRequestHandler):
+    """Stand-in for a URL shortener"""
+
+    def _respond(self, method):
+        REQUEST_COUNT[method] += 1
+        if self.path.startswith('/short/'):
+            # Two hops, like a shortener bouncing through a tracker
+            self.send_response(301)
+            self.send_header('Location', f"/hop/{self.path.split('/')[-1]}")
+            self.end_headers()
+        elif self.path.startswith('/hop/'):
+            self.send_response(302)
+            self.send_header('Location', f"/target/{self.path.split('/')[-1]}")
+            self.end_headers()
+        elif self.path.startswith('/nohead/'):
+            # Servers that reject HEAD must still be resolved via GET
+            if method == 'HEAD':
+                self.send_response(405)
+                self.end_headers()
+            else:
+                self.send_response(302)
+                self.send_header('Location', '/target/nohead')
+                self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain')
+            self.end_headers()
+            if method == 'GET':
+                self.wfile.write(b"ok")
+
+    def do_HEAD(self):
+        self._respond('HEAD')
+
+    def do_GET(self):
+        self._respond('GET')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    """Serve RedirectHandler on a free local port; returns (server, base URL)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RedirectHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_resolution():
+    """Redirects are followed, HEAD falls back to GET, plain links are left alone"""
+    server, base = start_server()
+    try:
+        resolver = LinkResolver(os.path.join(tempfile.mkdtemp(), 'link_cache.json'), max_workers=4)
+        posts = [
+            {'title': 'A', 'links': [{'url': f"{base}/short/abc", 'text': 'short'}]},
+            {'title': 'B', 'links': [{'url': f"{base}/short/abc", 'text': 'same short link'},
+                                     {'url': f"{base}/nohead/x", 'text': 'no HEAD'},
+                                     {'url': f"{base}/target/direct", 'text': 'direct'}]},
+        ]
+        expanded = resolver.enrich_posts(posts)
+
+        assert posts[0]['links'][0].get('resolved') == f"{base}/target/abc", posts[0]['links'][0]
+        print("✅ Multi-hop redirect resolved")
+        assert posts[1]['links'][1].get('resolved') == f"{base}/target/nohead", posts[1]['links'][1]
+        print("✅ HEAD-rejecting server resolved via GET")
+        assert 'resolved' not in posts[1]['links'][2] and expanded == 3, (expanded, posts[1]['links'][2])
+        print("✅ Non-redirecting link left as is")
+    finally:
+        server.shutdown()
+
+
+def test_persistent_cache():
+    """A fresh resolver answers from the saved cache without any requests"""
+    server, base = start_server()
+    try:
+        cache_path = os.path.join(tempfile.mkdtemp(), 'link_cache.json')
+        LinkResolver(cache_path).enrich_posts([{'title': 'A', 'links': [{'url': f"{base}/short/abc", 'text': ''}]}])
+
+        before = dict(REQUEST_COUNT)
+        cached = LinkResolver(cache_path).resolve(f"{base}/short/abc")
+        assert cached == f"{base}/target/abc", cached
+        assert REQUEST_COUNT == before, f"requests {before} -> {REQUEST_COUNT}"
+        print("✅ Persistent cache reused across runs")
+    finally:
+        server.shutdown()
+
+
+def test_notified_before_resolution():
+    """New posts are notified first; the resolved targets are stored afterwards"""
+    from coordination import Coordinator, LocalCoordinationBackend
+    from phase_deadlines import PhaseWatchdog
+    from post_rules import RuleEngine
+    from post_store import PostStore
+    from post_monitor import SupersetPostMonitor
+
+    server, base = start_server()
+    try:
+        handed_over = []
+        monitor = SimpleNamespace(
+            known_posts=PostStore(os.path.join(tempfile.mkdtemp(), 'known_posts.json')),
+            rules=RuleEngine(),
+            coordinator=Coordinator(LocalCoordinationBackend()),
+            watchdog=PhaseWatchdog({}),
+            detail_fetcher=None,
+            link_resolver=LinkResolver(os.path.join(tempfile.mkdtemp(), 'link_cache.json')),
+        )
+        monitor.expand_links = lambda posts: SupersetPostMonitor.expand_links(monitor, posts)
+        monitor.watchdog.start_cycle()
+
+        def on_new_posts(batch):
+            handed_over.append([[link.get('resolved') for link in post['links']] for post in batch])
+
+        feed = [{'title': 'A', 'links': [{'url': f"{base}/short/abc", 'text': 'short'}]}]
+        SupersetPostMonitor._diff_batches(monitor, [feed], [], False, on_new_posts)
+
+        assert handed_over == [[[None]], []], handed_over
+        assert monitor.known_posts['A'].to_dict()['links'][0]['resolved'] == f"{base}/target/abc"
+        print("✅ Notified before resolution, targets stored after")
+    finally:
+        server.shutdown()
+
+
+def main():
+    print("🧪 Testing link resolver")
+    print("=" * 40)
+    passed = True
+    for test in (test_resolution, test_persistent_cache, test_notified_before_resolution):
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+            passed = False
+    print("\n✅ Link resolver test passed!" if passed else "\n❌ Link resolver test failed")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
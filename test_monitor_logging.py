@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that buffered log output is written at the end of a
+cycle, on warnings, and once a line has waited LOG_FLUSH_INTERVAL
+"""
+
+import io
+import sys
+import time
+import logging
+from monitor_logging import TimedMemoryHandler
+
+
+def buffered_logger(name, flush_interval):
+    output = io.StringIO()
+    handler = TimedMemoryHandler(500, flush_interval, target=logging.StreamHandler(output))
+    logger = logging.getLogger(f"test_monitor_logging.{name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger, handler, output
+
+
+def test_buffered_until_flush():
+    """INFO lines wait in the buffer; a warning writes everything out"""
+    logger, handler, output = buffered_logger('cycle', 0)
+    try:
+        logger.info("one")
+        logger.info("two")
+        assert output.getvalue() == ""
+        logger.warning("three")
+        assert output.getvalue().split() == ["one", "two", "three"]
+        logger.info("four")
+        handler.flush()
+        assert output.getvalue().split()[-1] == "four"
+        print("✅ Lines buffered until a warning or flush")
+    finally:
+        handler.close()
+
+
+def test_waiting_line_written():
+    """A line logged between cycles is written once it has waited the flush interval"""
+    logger, handler, output = buffered_logger('timed', 0.2)
+    try:
+        logger.info("notified between cycles")
+        assert output.getvalue() == ""
+        deadline = time.monotonic() + 2
+        while not output.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert output.getvalue().strip() == "notified between cycles"
+        print("✅ Waiting line written without another log call")
+    finally:
+        handler.close()
+
+
+def main():
+    print("🧪 Testing log buffering")
+    print("=" * 40)
+    passed = True
+    for test in (test_buffered_until_flush, test_waiting_line_written):
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+            passed = False
+    print("\n✅ Log buffering test passed!" if passed else "\n❌ Log buffering test failed")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
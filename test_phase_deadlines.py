@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script to verify phase deadlines: per-cycle budgets, timeouts, late
+results handed to dispose, and closing a browser whose quit() hangs
+"""
+
+import sys
+import time
+import threading
+from types import SimpleNamespace
+from phase_deadlines import PhaseWatchdog, PhaseTimeout
+
+
+def expect_timeout(fn, *args, **kwargs):
+    try:
+        fn(*args, **kwargs)
+    except PhaseTimeout as e:
+        return e
+    raise AssertionError("expected a PhaseTimeout")
+
+
+def test_results_and_errors_pass_through():
+    """Calls within budget return their result or raise their own error"""
+    watchdog = PhaseWatchdog({'login': 1})
+    watchdog.start_cycle()
+    assert watchdog.run('login', lambda x: x * 2, 21) == 42
+    try:
+        watchdog.run('login', lambda: 1 / 0)
+    except ZeroDivisionError:
+        pass
+    else:
+        raise AssertionError("the call's own error should propagate")
+    print("✅ Results and errors pass through")
+
+
+def test_budget_is_per_cycle():
+    """Time spent in a phase adds up across calls until the next cycle starts"""
+    timed_out = []
+    watchdog = PhaseWatchdog({'scroll': 0.3}, on_timeout=timed_out.append)
+    watchdog.start_cycle()
+    watchdog.run('scroll', time.sleep, 0.2)
+    error = expect_timeout(watchdog.run, 'scroll', time.sleep, 0.2)
+    assert error.phase == 'scroll' and timed_out == ['scroll']
+    # Budget already used up: fails straight away without calling anything
+    calls = []
+    expect_timeout(watchdog.run, 'scroll', calls.append, 1)
+    assert calls == []
+    assert watchdog.timeouts['scroll'] == 2
+    watchdog.end_cycle()
+
+    watchdog.start_cycle()
+    watchdog.run('scroll', time.sleep, 0.2)
+    watchdog.end_cycle()
+    assert watchdog.latency_summary()['scroll']['timeouts'] == 2
+    print("✅ Phase budgets add up within a cycle and reset between cycles")
+
+
+def test_late_result_disposed():
+    """A result that arrives after the deadline goes to dispose, an on-time one doesn't"""
+    watchdog = PhaseWatchdog({'driver_start': 0.2})
+    disposed = []
+    arrived = threading.Event()
+
+    def slow_start():
+        time.sleep(0.4)
+        arrived.set()
+        return 'late browser'
+
+    watchdog.start_cycle()
+    expect_timeout(watchdog.run_owned, 'driver_start', slow_start, disposed.append)
+    assert arrived.wait(2)
+    time.sleep(0.05)
+    assert disposed == ['late browser']
+
+    watchdog.start_cycle()
+    assert watchdog.run_owned('driver_start', lambda: 'browser', disposed.append) == 'browser'
+    assert disposed == ['late browser']
+    print("✅ Late results disposed")
+
+
+def test_hanging_quit_is_bounded():
+    """A browser whose quit() never returns is killed after the driver_stop deadline"""
+    from post_monitor import SupersetPostMonitor
+
+    killed = []
+    monitor = SimpleNamespace(
+        watchdog=None,
+        driver=SimpleNamespace(quit=lambda: threading.Event().wait()),
+        service=object(),
+        kill_browser=lambda: killed.append(True),
+    )
+    monitor.watchdog = PhaseWatchdog({'driver_stop': 0.2}, on_timeout=lambda phase: monitor.kill_browser())
+    monitor.watchdog.start_cycle()
+
+    started = time.monotonic()
+    SupersetPostMonitor.close_browser(monitor)
+    assert time.monotonic() - started < 2
+    assert killed and monitor.driver is None and monitor.service is None
+    print("✅ Hanging quit() bounded by driver_stop")
+
+
+def main():
+    print("🧪 Testing phase deadlines")
+    print("=" * 40)
+    tests = [test_results_and_errors_pass_through, test_budget_is_per_cycle,
+             test_late_result_disposed, test_hanging_quit_is_bounded]
+    passed = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+            passed = False
+    print("\n✅ Phase deadline test passed!" if passed else "\n❌ Phase deadline test failed")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
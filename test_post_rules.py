@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the post rules engine: the keyword automaton, the
+combined regex pass and rule outcomes
+"""
+
+import os
+import sys
+import tempfile
+from post_rules import KeywordMatcher, RuleEngine
+
+EXAMPLE_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'post_rules.example.json')
+
+BTECH_POST = {
+    'title': "Open for applications - Conglomerate IT's Job Profile - Data Science, AI Intern",
+    'details': "Applicable Courses\nM.Tech. - Computer Science & Engineering\n"
+               "B.Tech. - Computer Science & Engineering, KIITB_17\nCGPA 7.0 and above, 2026 batch",
+}
+MTECH_POST = {
+    'title': "Open for applications - Murphi.ai's Job Profile - AI/ML Intern",
+    'details': "Applicable Courses\nM.Tech. - Computer Science & Engineering, KIITB_17",
+}
+
+
+def test_keyword_whole_words():
+    """Keywords only match as whole words, case-insensitively"""
+    matcher = KeywordMatcher([('IT', 0), ('AI', 1)])
+    assert matcher.matching_rules("Conglomerate IT hiring") == {0}
+    assert matcher.matching_rules("please submit your form") == set()
+    assert matcher.matching_rules("Data Science, ai intern") == {1}
+    assert matcher.matching_rules("it") == {0}
+    assert matcher.matching_rules("IT-services (AI)") == {0, 1}
+    assert matcher.matching_rules("PAID internship") == set()
+    print("✅ Keywords match whole words only")
+
+
+def test_keyword_overlaps():
+    """Overlapping and nested keywords are all found via the failure links"""
+    matcher = KeywordMatcher([('he', 0), ('she', 1), ('his', 2), ('hers', 3), ('data science', 4)])
+    assert matcher.matching_rules("she") == {1}
+    assert matcher.matching_rules("ushers") == set()  # Inside a longer word
+    assert matcher.matching_rules("u hers") == {3}
+    assert matcher.matching_rules("he, she and his") == {0, 1, 2}
+    # "science" restarts inside a failed "data sc..." prefix
+    assert matcher.matching_rules("data data science") == {4}
+    assert matcher.matching_rules("big-data science") == {4}
+    print("✅ Overlapping keywords matched")
+
+
+def test_rule_outcomes():
+    """Each rule matches or not on its own merits, and suppression applies"""
+    engine = RuleEngine.from_file(EXAMPLE_RULES)
+    btech = engine.evaluate(BTECH_POST)
+    mtech = engine.evaluate(MTECH_POST)
+
+    assert 'my-branch' in btech.matched
+    assert 'my-batch' in btech.matched
+    assert 'cgpa-within-reach' in btech.matched
+    assert 'dream-companies' not in btech.matched
+    assert not btech.suppressed, "a post open to B.Tech must not be suppressed"
+    assert btech.priority == 5
+
+    assert mtech.matched == ['mtech-only']
+    assert mtech.suppressed
+
+    dream = engine.evaluate({'title': 'Google - SWE Intern', 'details': ''})
+    assert dream.matched == ['dream-companies'] and dream.routes == ['dream-companies']
+    assert dream.priority == 10
+    print("✅ Rules match, prioritize and suppress as configured")
+
+
+def test_regex_candidate_positions():
+    """The combined regex finds every rule even when matches overlap or start late"""
+    engine = RuleEngine([
+        {'name': 'intern', 'regex': [r'intern\b']},
+        {'name': 'internship', 'regex': [r'internship']},
+        {'name': 'late', 'regex': [r'stipend:\s*\d+']},
+        {'name': 'absent', 'regex': [r'full[- ]time']},
+    ])
+    result = engine.evaluate({'title': 'Internship', 'details': 'AI intern, stipend: 20000'})
+    assert result.matched == ['intern', 'internship', 'late']
+    print("✅ Combined regex pass finds every matching rule")
+
+
+def test_uncombinable_patterns():
+    """Global flags and backreferences are searched on their own; bad patterns are skipped"""
+    engine = RuleEngine([
+        {'name': 'flags', 'regex': [r'(?s)Applicable Courses.*M\.Tech']},
+        {'name': 'repeat', 'regex': [r'\b(\w+) \1\b']},
+        {'name': 'plain', 'regex': [r'B\.Tech']},
+        {'name': 'broken', 'regex': [r'(unclosed']},
+    ])
+    result = engine.evaluate({'title': 'Hiring hiring now', 'details': 'Applicable Courses\nM.Tech.'})
+    assert result.matched == ['flags', 'repeat']
+    result = engine.evaluate({'title': 'One two', 'details': 'B.Tech only'})
+    assert result.matched == ['plain']
+    print("✅ Uncombinable patterns handled separately")
+
+
+def test_malformed_rules_file():
+    """A broken rules file leaves the monitor running without rules"""
+    path = os.path.join(tempfile.mkdtemp(), 'post_rules.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"rules": [')
+    engine = RuleEngine.from_file(path)
+    assert len(engine) == 0
+    assert not engine.evaluate(BTECH_POST).matched
+    print("✅ Malformed rules file ignored")
+
+
+def main():
+    print("🧪 Testing post rules")
+    print("=" * 40)
+    tests = [test_keyword_whole_words, test_keyword_overlaps, test_rule_outcomes,
+             test_regex_candidate_positions, test_uncombinable_patterns, test_malformed_rules_file]
+    passed = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+            passed = False
+    print("\n✅ Post rules test passed!" if passed else "\n❌ Post rules test failed")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
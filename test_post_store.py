@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the compact known-posts store: the on-disk formats, the
+migrations from older ones, and retention with the archive
+"""
+
+import os
+import sys
+import gzip
+import json
+import base64
+import tempfile
+from datetime import datetime
+from post_store import PostStore, STORE_FORMAT, COMPRESS_THRESHOLD
+
+
+def make_posts(count):
+    """Posts with repeated authors, links and long bodies, like the real feed"""
+    posts = {
+        f"Open for applications - Company {i}'s Job Profile - Intern": {
+            'title': f"Open for applications - Company {i}'s Job Profile - Intern",
+            'author': f"Placement Cell {i % 3}",
+            'time': '2 hours ago',
+            'details': ('Applicable Courses\nB.Tech. - Computer Science & Engineering, KIITB_17\n'
+                        f'CGPA 7.{i % 10} and above\nRole {i}\n') * 3,
+            'links': [{'url': 'https://forms.example.com/apply', 'text': 'Apply'}] if i % 2 else [],
+            'main_link': 'https://app.joinsuperset.com/students',
+            'first_seen': f"2025-01-{i % 28 + 1:02d}T10:00:00",
+        }
+        for i in range(count)
+    }
+    # The store leaves out an empty links list, as the monitor's own records do
+    for post in posts.values():
+        if not post['links']:
+            del post['links']
+    return posts
+
+
+def temp_path(name='known_posts.json'):
+    return os.path.join(tempfile.mkdtemp(), name)
+
+
+def as_dicts(store):
+    return {title: post.to_dict() for title, post in store.items()}
+
+
+def test_round_trip():
+    """Posts saved in the current format load back unchanged"""
+    path = temp_path()
+    posts = make_posts(20)
+    store = PostStore(path)
+    for title, data in posts.items():
+        store[title] = data
+    store.save()
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    assert raw.startswith(b'\x1f\x8b'), "the store should be gzip-compressed"
+    assert json.loads(gzip.decompress(raw))['format'] == STORE_FORMAT
+
+    loaded = PostStore(path).load()
+    assert as_dicts(loaded) == posts
+    # Long bodies stay compressed in memory and are decompressed on access
+    title = next(iter(posts))
+    assert isinstance(loaded[title]._details, bytes)
+    assert loaded[title].details_length == len(posts[title]['details']) >= COMPRESS_THRESHOLD
+    print("✅ Current format round-trips")
+
+
+def test_plain_json_migration():
+    """The original {title: post} JSON loads and is rewritten in the current format"""
+    path = temp_path()
+    posts = make_posts(10)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(posts, f, indent=2, ensure_ascii=False)
+
+    store = PostStore(path).load()
+    assert as_dicts(store) == posts
+    store.save()
+    with open(path, 'rb') as f:
+        assert f.read(2) == b'\x1f\x8b'
+    assert as_dicts(PostStore(path).load()) == posts
+    print("✅ Plain JSON migrated")
+
+
+def test_format_2_migration():
+    """Format 2 (plain JSON with base64 zlib bodies) loads and is converted on save"""
+    path = temp_path()
+    posts = make_posts(12)
+    store = PostStore(path)
+    for title, data in posts.items():
+        store[title] = data
+    store.train_dictionary()
+
+    # Write it out the way format 2 did
+    doc = json.loads(store.to_json())
+    doc['format'] = 2
+    for record, post in zip(doc['posts'], store.values()):
+        if isinstance(post._details, bytes):
+            del record['details']
+            record['details_z'] = base64.b64encode(post._details).decode('ascii')
+            record['details_length'] = post.details_length
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(doc, f)
+
+    loaded = PostStore(path).load()
+    assert as_dicts(loaded) == posts
+    loaded.save()
+    assert as_dicts(PostStore(path).load()) == posts
+    print("✅ Format 2 migrated")
+
+
+def test_legacy_list_starts_fresh():
+    """The oldest format (a bare list of titles) is ignored rather than misread"""
+    path = temp_path()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(['a title', 'another'], f)
+    assert len(PostStore(path).load()) == 0
+    print("✅ Legacy title list ignored")
+
+
+def test_retention_by_count():
+    """Only the newest max_posts stay in memory; the rest are archived but still known"""
+    path = temp_path()
+    posts = make_posts(20)
+    store = PostStore(path, max_posts=5)
+    for title, data in posts.items():
+        store[title] = data
+    store.save()
+
+    newest = sorted(posts, key=lambda title: posts[title]['first_seen'], reverse=True)
+    assert set(store) == set(newest[:5])
+    assert store.archived_count == 15 and store.total_count == 20
+    for title in posts:
+        assert title in store, f"{title} should still count as known"
+    assert 'Never seen' not in store
+
+    # Archived posts come back in full from the archive file
+    archived = {record['key']: record for record in store.iter_archived()}
+    assert set(archived) == set(newest[5:])
+    for title, record in archived.items():
+        assert record['details'] == posts[title]['details']
+
+    # Membership survives a reload
+    loaded = PostStore(path, max_posts=5).load()
+    assert all(title in loaded for title in posts)
+    assert loaded.archived_count == 15
+    print("✅ Count-based retention archives the oldest posts")
+
+
+def test_retention_by_age():
+    """Posts first seen before the retention window are archived"""
+    store = PostStore(temp_path(), retention_days=10)
+    store['old'] = {'title': 'old', 'first_seen': '2025-01-01T00:00:00'}
+    store['new'] = {'title': 'new', 'first_seen': '2025-01-25T00:00:00'}
+    evicted = store.enforce_retention(now=datetime(2025, 1, 30))
+    assert evicted == 1
+    assert list(store) == ['new']
+    assert 'old' in store and store.is_archived('old')
+    print("✅ Age-based retention archives old posts")
+
+
+def test_upsert_many():
+    """Bulk upserts insert new posts, only lengthen existing ones and skip archived ones"""
+    store = PostStore(temp_path(), max_posts=2)
+    store['old'] = {'title': 'old', 'details': 'old', 'first_seen': '2025-01-01T00:00:00'}
+    store['short'] = {'title': 'short', 'details': 'short', 'first_seen': '2025-01-02T00:00:00'}
+    store['long'] = {'title': 'long', 'details': 'already long', 'first_seen': '2025-01-03T00:00:00'}
+    store.enforce_retention()
+    assert store.is_archived('old')
+
+    inserted, updated = store.upsert_many({
+        'old': {'title': 'old', 'details': 'old, now with more details'},
+        'short': {'title': 'short', 'details': 'short, now with more details',
+                  'links': [{'url': 'https://example.com', 'text': 'more'}]},
+        'long': {'title': 'long', 'details': 'short'},
+        'new': {'title': 'new', 'details': 'new', 'first_seen': '2025-01-04T00:00:00'},
+    })
+    assert (inserted, updated) == (1, 1), (inserted, updated)
+    assert store['short']['details'] == 'short, now with more details'
+    assert store['short'].to_dict()['links'] == [{'url': 'https://example.com', 'text': 'more'}]
+    assert store['long']['details'] == 'already long'
+    assert 'old' not in set(store) and store.is_archived('old')
+    assert store.total_count == 4
+    print("✅ Bulk upsert inserts, lengthens and skips archived posts")
+
+
+def main():
+    print("🧪 Testing known-posts store")
+    print("=" * 40)
+    tests = [test_round_trip, test_plain_json_migration, test_format_2_migration, test_legacy_list_starts_fresh,
+             test_retention_by_count, test_retention_by_age, test_upsert_many]
+    passed = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+            passed = False
+    print("\n✅ Known-posts store test passed!" if passed else "\n❌ Known-posts store test failed")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify bulk re-extraction from saved pages: posts found on
+several pages are merged into one record and upserted into known_posts
+"""
+
+import os
+import sys
+import gzip
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+from fake_superset import FakeSuperset
+from post_store import PostStore
+from post_monitor import SupersetPostMonitor
+
+PAGE_URL = 'http://127.0.0.1/students'
+
+
+def save_page(directory, name, html, saved_at):
+    """Write a page as the monitor's debug dumps would be, dated saved_at"""
+    path = os.path.join(directory, name)
+    opener = gzip.open if name.endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        f.write(f'<html><body>{html}</body></html>')
+    os.utime(path, (saved_at.timestamp(), saved_at.timestamp()))
+    return path
+
+
+def reextract(directory, store):
+    monitor = SimpleNamespace(dashboard_url=PAGE_URL, known_posts=store, save_known_posts=store.save)
+    return SupersetPostMonitor.reextract_pages(monitor, directory, workers=2)
+
+
+def test_pages_deduplicated():
+    """A post on several pages becomes one record with the longest details and the earliest page time"""
+    site = FakeSuperset(posts=40, page_size=20)
+    first_page, second_page = site.feed_page(0)['html'], site.feed_page(1)['html']
+    title = site.posts[0].title
+    longer = first_page.replace('<p>Eligibility</p>', '<p>Eligibility</p><p>Stipend: 50,000 per month</p>', 1)
+
+    directory = tempfile.mkdtemp()
+    save_page(directory, 'page_source_debug.html', first_page, datetime(2025, 3, 2))
+    save_page(directory, 'older.html', first_page, datetime(2025, 3, 1))
+    save_page(directory, 'newer.html.gz', longer, datetime(2025, 3, 3))
+    save_page(directory, 'second.htm', second_page, datetime(2025, 3, 2))
+    save_page(directory, 'notes.txt', first_page, datetime(2025, 3, 1))
+
+    store = PostStore(os.path.join(tempfile.mkdtemp(), 'known_posts.json'))
+    assert reextract(directory, store) == 40
+    assert len(store) == 40
+    assert 'Stipend: 50,000 per month' in store[title]['details']
+    assert store[title]['first_seen'] == datetime(2025, 3, 1).isoformat()
+
+    # Saved once, and running it again finds nothing new
+    assert len(PostStore(store.path).load()) == 40
+    assert reextract(directory, PostStore(store.path).load()) == 0
+    print("✅ Pages deduplicated and upserted")
+
+
+def test_no_pages():
+    """A directory without saved pages is reported, not an error"""
+    store = PostStore(os.path.join(tempfile.mkdtemp(), 'known_posts.json'))
+    assert reextract(tempfile.mkdtemp(), store) == 0 and len(store) == 0
+    print("✅ Empty directory handled")
+
+
+def main():
+    print("🧪 Testing bulk re-extraction")
+    print("=" * 40)
+    passed = True
+    for test in (test_pages_deduplicated, test_no_pages):
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+            passed = False
+    print("\n✅ Re-extraction test passed!" if passed else "\n❌ Re-extraction test failed")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
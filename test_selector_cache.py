@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that the selector cache keeps specific selectors in
+front of generic fallbacks
+"""
+
+import os
+import sys
+import tempfile
+from selector_cache import SelectorCache, PROMOTE_AFTER, REPROBE_EVERY
+
+SITE = 'app.joinsuperset.com'
+SELECTORS = [
+    ('css selector', 'div.overflow-y-auto.posts-container'),
+    ('css selector', 'div.overflow-y-auto'),
+    ('css selector', '[class*="overflow-scroll"]'),
+]
+
+
+def new_cache():
+    return SelectorCache(os.path.join(tempfile.mkdtemp(), 'selector_cache.json'))
+
+
+def lookup(cache, present):
+    """Do what the monitor does: try selectors in cache order, record the first present one"""
+    for selector in cache.ordered(SITE, 'scroll_container', SELECTORS):
+        if selector in present:
+            cache.record(SITE, 'scroll_container', selector)
+            return selector
+    cache.record_failure(SITE, 'scroll_container')
+    return None
+
+
+def test_specific_selector_cached():
+    """The most specific selector is cached as soon as it matches"""
+    cache = new_cache()
+    assert lookup(cache, set(SELECTORS)) == SELECTORS[0]
+    assert cache.cached(SITE, 'scroll_container') == SELECTORS[0]
+    assert cache.ordered(SITE, 'scroll_container', SELECTORS)[0] == SELECTORS[0]
+    print("✅ Specific selector cached")
+
+
+def test_one_generic_win_is_not_cached():
+    """A generic selector winning once (page still rendering) doesn't take the front"""
+    cache = new_cache()
+    assert lookup(cache, {SELECTORS[2]}) == SELECTORS[2]
+    assert cache.cached(SITE, 'scroll_container') is None
+
+    lookup(cache, set(SELECTORS))
+    assert cache.cached(SITE, 'scroll_container') == SELECTORS[0]
+
+    # Same once something specific is cached
+    lookup(cache, {SELECTORS[2]})
+    assert cache.cached(SITE, 'scroll_container') == SELECTORS[0]
+    assert lookup(cache, set(SELECTORS)) == SELECTORS[0]
+    print("✅ A single generic win is not cached")
+
+
+def test_generic_promoted_after_repeated_misses():
+    """If the specific selectors keep missing, the generic one is cached after a few lookups"""
+    cache = new_cache()
+    for _ in range(PROMOTE_AFTER):
+        lookup(cache, {SELECTORS[2]})
+    assert cache.cached(SITE, 'scroll_container') == SELECTORS[2]
+    assert cache.ordered(SITE, 'scroll_container', SELECTORS)[0] == SELECTORS[2]
+    print("✅ Generic selector cached after repeated misses")
+
+
+def test_specific_selector_wins_front_back():
+    """A cached generic selector gives way once a specific one matches again on a re-probe"""
+    cache = new_cache()
+    for _ in range(PROMOTE_AFTER):
+        lookup(cache, {SELECTORS[2]})
+    assert cache.cached(SITE, 'scroll_container') == SELECTORS[2]
+
+    # The specific container is back, but the generic one still matches too
+    found = [lookup(cache, set(SELECTORS)) for _ in range(REPROBE_EVERY)]
+    assert SELECTORS[0] in found, "the list was never tried in its own order"
+    assert cache.cached(SITE, 'scroll_container') == SELECTORS[0]
+    assert lookup(cache, set(SELECTORS)) == SELECTORS[0]
+    print("✅ Specific selector re-probed and restored")
+
+
+def test_cache_persists():
+    """Cached selectors and the pending candidate survive a save and reload"""
+    cache = new_cache()
+    lookup(cache, set(SELECTORS))
+    lookup(cache, {SELECTORS[2]})
+    cache.save()
+    reloaded = SelectorCache(cache.path)
+    assert reloaded.cached(SITE, 'scroll_container') == SELECTORS[0]
+    assert reloaded.stats()['hits'] == 0 and reloaded.stats()['misses'] == 2
+    print("✅ Cache persisted")
+
+
+def main():
+    print("🧪 Testing selector cache")
+    print("=" * 40)
+    tests = [test_specific_selector_cached, test_one_generic_win_is_not_cached,
+             test_generic_promoted_after_repeated_misses, test_specific_selector_wins_front_back,
+             test_cache_persists]
+    passed = True
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__doc__}: {e}")
+            passed = False
+    print("\n✅ Selector cache test passed!" if passed else "\n❌ Selector cache test failed")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
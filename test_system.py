@@ -4,8 +4,8 @@ Test script to verify the complete post monitoring system
 """
 
 import os
-import json
 from post_monitor import SupersetPostMonitor
+from post_store import PostStore
 
 def test_environment():
     """Test environment variable loading"""
@@ -33,22 +33,22 @@ def test_known_posts_system():
         'author': 'Test Author',
         'time': '1 hour ago',
         'link': 'https://test.com',
+        'details': 'Applicable Courses\nB.Tech. - Computer Science & Engineering, KIITB_17\n' * 10,
         'first_seen': '2025-01-28T10:00:00'
     }
     
     # Test saving
-    known_posts = {'Test Post Title': test_post}
+    known_posts = PostStore('test_known_posts.json')
+    known_posts['Test Post Title'] = test_post
     
     try:
-        with open('test_known_posts.json', 'w', encoding='utf-8') as f:
-            json.dump(known_posts, f, indent=2, ensure_ascii=False)
+        known_posts.save()
         print("✅ Post storage system working")
         
         # Test loading
-        with open('test_known_posts.json', 'r', encoding='utf-8') as f:
-            loaded_posts = json.load(f)
+        loaded_posts = PostStore('test_known_posts.json').load()
         
-        if loaded_posts == known_posts:
+        if loaded_posts['Test Post Title'].to_dict() == known_posts['Test Post Title'].to_dict():
             print("✅ Post loading system working")
         else:
             print("❌ Post loading failed")
@@ -71,8 +71,7 @@ def show_current_status():
     # Check if known_posts.json exists
     if os.path.exists('known_posts.json'):
         try:
-            with open('known_posts.json', 'r', encoding='utf-8') as f:
-                known_posts = json.load(f)
+            known_posts = PostStore('known_posts.json').load()
             print(f"📋 Known posts file exists with {len(known_posts)} posts")
             
             if len(known_posts) > 0: